@@ -0,0 +1,109 @@
+# Vectorized indicators over the price history in price_store.
+
+import numpy as np
+
+from price_store import PRICE_COLUMNS, to_jalali
+
+GRAMS_PER_OUNCE = 31.1035
+# Pure gold in one Emami coin: 8.133 g at 900/1000 fineness.
+EMAMI_GOLD_GRAMS = 8.133 * 0.9
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def moving_average(values, window):
+    """Trailing simple moving average (NaN until window samples are available)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        sums = np.cumsum(np.insert(values, 0, 0.0))
+        out[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return out
+
+
+def log_returns(values):
+    values = np.asarray(values, dtype=np.float64)
+    return np.diff(np.log(values))
+
+
+def volatility(values):
+    """Standard deviation of log returns, in percent"""
+    returns = log_returns(values)
+    returns = returns[np.isfinite(returns)]
+    return float(np.std(returns) * 100) if len(returns) > 1 else None
+
+
+def intrinsic_emami(ounce_usd, tether_toman):
+    """Gold value of an Emami coin in Toman at the world price and tether rate"""
+    return np.asarray(ounce_usd) * np.asarray(tether_toman) * EMAMI_GOLD_GRAMS / GRAMS_PER_OUNCE
+
+
+def intrinsic_gold_18k(ounce_usd, tether_toman):
+    """Value of one gram of 18K (750/1000) gold in Toman at the world price and tether rate"""
+    return np.asarray(ounce_usd) * np.asarray(tether_toman) * 0.75 / GRAMS_PER_OUNCE
+
+
+def coin_premium(records):
+    """Emami coin premium over its gold value, in percent, per record"""
+    return (records["emami_toman"] / intrinsic_emami(records["ounce_usd"], records["tether_toman"]) - 1) * 100
+
+
+def gold_18k_premium(records):
+    """18K gold premium over ounce x tether, in percent, per record"""
+    return (records["gold_18k_toman"] / intrinsic_gold_18k(records["ounce_usd"], records["tether_toman"]) - 1) * 100
+
+
+def _last_valid(values):
+    valid = values[np.isfinite(values)]
+    return float(valid[-1]) if len(valid) else None
+
+
+def _round(value, digits=2):
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+def _change(records, column, seconds):
+    """Percent change of column versus the last value at least `seconds` older"""
+    ts = records["ts"]
+    values = records[column]
+    idx = int(np.searchsorted(ts, ts[-1] - seconds, side="right")) - 1
+    if idx < 0 or not np.isfinite(values[idx]) or not np.isfinite(values[-1]):
+        return None
+    return _round((values[-1] / values[idx] - 1) * 100)
+
+
+def summarize(store, days=30, short_window=12, long_window=48):
+    """Compact indicator summary over the last `days` of history, for the advice prompt"""
+    last_ts = store.last_timestamp()
+    if last_ts is None:
+        return None
+    records = np.asarray(store.range(last_ts - days * DAY, None))
+
+    summary = {"samples": int(len(records)), "since": to_jalali(records["ts"][0]), "until": to_jalali(last_ts)}
+    for column in PRICE_COLUMNS:
+        values = records[column]
+        if not np.isfinite(values).any():
+            continue
+        valid = values[np.isfinite(values)]
+        summary[column] = {
+            "last": _last_valid(values),
+            "change_1h_pct": _change(records, column, HOUR),
+            "change_24h_pct": _change(records, column, DAY),
+            "change_7d_pct": _change(records, column, 7 * DAY),
+            "ma_short": _round(_last_valid(moving_average(valid, short_window))),
+            "ma_long": _round(_last_valid(moving_average(valid, long_window))),
+            "volatility_pct": _round(volatility(valid), 3),
+        }
+
+    premium = coin_premium(records)
+    summary["emami_premium_pct"] = {
+        "last": _round(_last_valid(premium)),
+        "average": _round(np.nanmean(premium)) if np.isfinite(premium).any() else None,
+    }
+    gold_premium = gold_18k_premium(records)
+    summary["gold_18k_premium_pct"] = {
+        "last": _round(_last_valid(gold_premium)),
+        "average": _round(np.nanmean(gold_premium)) if np.isfinite(gold_premium).any() else None,
+    }
+    return summary
@@ -0,0 +1,76 @@
+# Micro-benchmark for find_latest_price_post.
+#
+#   python bench_parse.py page1.html page2.html   # saved t.me/s/<channel> pages
+#   python bench_parse.py                         # synthetic 20-post page
+#
+# Compares the full BeautifulSoup parse (html.parser, and lxml if installed)
+# with the fast reverse scan, and checks that they return the same post.
+
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from fast_html import find_latest_matching_post
+from price import PRICE_KEYWORDS, PRICE_MATCHER
+
+
+def find_with_soup(html, parser):
+    soup = BeautifulSoup(html, parser)
+    posts = soup.select("div.tgme_widget_message_text")
+    if not posts:
+        return None
+    for post in reversed(posts):
+        text = post.get_text("\n", strip=True)
+        if any(k in text for k in PRICE_KEYWORDS):
+            return text
+    return posts[-1].get_text("\n", strip=True)
+
+
+def synthetic_page(posts=20):
+    """A channel page shaped like t.me/s output, with the price post in the middle"""
+    filler = "تحلیل بازار امروز &amp; اخبار اقتصادی <a href=\"https://example.com\">لینک</a> " * 20
+    prices = (
+        "💰 طلای ۱۸ عیار: ۹,۸۵۴,۰۰۰ تومان<br/>🥇 سکه امامی: ۱۰۴,۵۰۰,۰۰۰ تومان<br/>"
+        "🏅 سکه بهار آزادی: ۹۵,۲۰۰,۰۰۰ تومان<br/>🥈 نیم سکه: ۵۶,۰۰۰,۰۰۰ تومان<br/>"
+        "🥉 ربع سکه: ۳۲,۰۰۰,۰۰۰ تومان<br/>📈 اونس طلا: ۴,۲۵۱ دلار<br/>💸 تتر: ۱۱۳,۲۰۰ تومان"
+    )
+    blocks = []
+    for i in range(posts):
+        body = prices if i == posts // 2 else filler
+        blocks.append(
+            f'<div class="tgme_widget_message_wrap js-widget_message_wrap">'
+            f'<div class="tgme_widget_message text_not_supported_wrap js-widget_message" data-post="ecogold_ir/{1000 + i}">'
+            f'<div class="tgme_widget_message_bubble"><div class="tgme_widget_message_text js-message_text" dir="auto">'
+            f'<b>پست {i}</b><br/>{body}</div>'
+            f'<div class="tgme_widget_message_footer"><span class="tgme_widget_message_views">1.2K</span></div>'
+            f'</div></div></div>'
+        )
+    return "<html><head><title>channel</title></head><body>" + "".join(blocks) + "</body></html>"
+
+
+def bench(name, html, number=50):
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+
+    expected = find_with_soup(html, "html.parser")
+    print(f"\n📄 {name} ({len(html) / 1024:.0f} KB)")
+    for parser in parsers:
+        seconds = timeit.timeit(lambda: find_with_soup(html, parser), number=number) / number
+        print(f"   BeautifulSoup {parser:<12} {seconds * 1000:8.2f} ms")
+    fast = find_latest_matching_post(html, PRICE_MATCHER)
+    seconds = timeit.timeit(lambda: find_latest_matching_post(html, PRICE_MATCHER), number=number) / number
+    print(f"   fast scan                  {seconds * 1000:8.2f} ms  ({'same' if fast == expected else 'DIFFERENT'} result)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "r", encoding="utf-8") as f:
+                bench(path, f.read())
+    else:
+        bench("synthetic page", synthetic_page())
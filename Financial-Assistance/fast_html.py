@@ -0,0 +1,69 @@
+# Fast extraction of post texts from a t.me/s/<channel> page.
+#
+# Instead of building a full BeautifulSoup tree, the page is scanned from the
+# end for `tgme_widget_message_text` blocks. Each block is cut out by
+# counting nested <div>s, and its text nodes are joined the way
+# BeautifulSoup's get_text("\n", strip=True) joins them. All keywords are
+# matched in one pass with a single compiled alternation.
+
+import html as html_lib
+import re
+
+TEXT_CLASS = "tgme_widget_message_text"
+DIV_TAG = re.compile(r"<div\b|</div\s*>", re.IGNORECASE)
+TAG = re.compile(r"<[^>]*>")
+POST_ID = re.compile(r'data-post="[^"/]+/(\d+)"')
+
+
+def keyword_matcher(keywords):
+    """One compiled pattern matching any keyword (longest first)"""
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+
+def block_text(inner_html):
+    """Text of an HTML fragment, equivalent to BeautifulSoup get_text("\\n", strip=True)"""
+    parts = (html_lib.unescape(part).strip() for part in TAG.split(inner_html))
+    return "\n".join(part for part in parts if part)
+
+
+def _block_end(page, start):
+    """Index of the </div> closing the block whose content starts at start"""
+    depth = 1
+    for match in DIV_TAG.finditer(page, start):
+        depth += -1 if match.group().startswith("</") else 1
+        if depth == 0:
+            return match.start()
+    return len(page)
+
+
+def iter_posts_reversed(page):
+    """Yield (post_id or None, text) for every post text block, newest (last) first"""
+    end = len(page)
+    while True:
+        pos = page.rfind(TEXT_CLASS, 0, end)
+        if pos < 0:
+            return
+        tag_start = page.rfind("<", 0, pos)
+        tag_end = page.find(">", pos)
+        if tag_start < 0 or tag_end < 0:
+            return
+        end = tag_start
+        # Make sure this is the class of a <div>, not a longer class or other text.
+        tail = page[pos + len(TEXT_CLASS):pos + len(TEXT_CLASS) + 1]
+        if not page.startswith("<div", tag_start) or tail not in " \"'":
+            continue
+        content_end = _block_end(page, tag_end + 1)
+        id_pos = page.rfind('data-post="', 0, tag_start)
+        match = POST_ID.match(page, id_pos) if id_pos >= 0 else None
+        yield (int(match.group(1)) if match else None), block_text(page[tag_end + 1:content_end])
+
+
+def find_latest_matching_post(page, matcher):
+    """Text of the newest post matching the keyword pattern, else the newest post, else None"""
+    newest = None
+    for _, text in iter_posts_reversed(page):
+        if newest is None:
+            newest = text
+        if matcher.search(text):
+            return text
+    return newest
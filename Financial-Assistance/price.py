@@ -3,12 +3,40 @@ import requests
 from bs4 import BeautifulSoup
 from ollama import Client
 
+from analytics import summarize
+from fast_html import find_latest_matching_post, keyword_matcher
+from price_parser import parse_prices
+from price_store import PriceStore
+from retry import CircuitBreaker, RetryPolicy
+
 CHANNEL_USERNAME = "ecogold_ir"
 OLLAMA_MODEL = "gpt-oss:20b"
 OLLAMA_API_KEY = "***"
 
+# Below this share of recognized price fields the LLM extracts the prices instead.
+MIN_PARSER_CONFIDENCE = 0.7
+
+# Worst case per LLM call: 3 attempts within 90 seconds. After 3 consecutive
+# failures calls to ollama.com fail fast for 2 minutes; malformed JSON replies
+# are retried but do not count as failures.
+LLM_TIMEOUT = 30
+LLM_RETRY = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=20.0, deadline=90.0)
+LLM_BREAKER = CircuitBreaker(failure_threshold=3, reset_timeout=120.0)
+
 # https://t.me/s/ecogold_ir
 
+PRICE_KEYWORDS = [
+    "طلای ۱۸ عیار", "سکه امامی", "اونس طلا",
+    "سکه بهار آزادی", "نیم سکه", "ربع سکه", "تتر"
+]
+PRICE_MATCHER = keyword_matcher(PRICE_KEYWORDS)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
 def fetch_channel_html(username):
     url = f"https://t.me/s/{username}"
     headers = {"User-Agent": "Mozilla/5.0"}
@@ -17,19 +45,20 @@ def fetch_channel_html(username):
     return response.text
 
 def find_latest_price_post(html):
-    soup = BeautifulSoup(html, "html.parser")    
+    # Fast path: scan the raw page from the end and stop at the first price post.
+    post = find_latest_matching_post(html, PRICE_MATCHER)
+    if post is not None:
+        return post
+
+    # Fallback for unexpected markup: parse the whole page.
+    soup = BeautifulSoup(html, HTML_PARSER)
     posts = soup.select("div.tgme_widget_message_text")
     if not posts:
         return None
 
-    keywords = [
-        "طلای ۱۸ عیار", "سکه امامی", "اونس طلا",
-        "سکه بهار آزادی", "نیم سکه", "ربع سکه", "تتر"
-    ]
-
     for post in reversed(posts):
         text = post.get_text("\n", strip=True)
-        if any(k in text for k in keywords):
+        if PRICE_MATCHER.search(text):
             return text
 
     return posts[-1].get_text("\n", strip=True)
@@ -37,10 +66,18 @@ def find_latest_price_post(html):
 def create_client(api_key):
     return Client(
         host="https://ollama.com",
-        headers={"Authorization": f"Bearer {api_key}"}
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=LLM_TIMEOUT
     )
 
-def extract_prices(client, text):
+def extract_prices(client, text, min_confidence=MIN_PARSER_CONFIDENCE):
+    data, confidence = parse_prices(text)
+    if confidence >= min_confidence:
+        return data
+
+    return extract_prices_with_llm(client, text)
+
+def extract_prices_with_llm(client, text):
     system_prompt = """
         You are an assistant that extracts structured data and writes a short summary.
         Input is a Persian bulletin with prices of gold, coins, and tether.
@@ -57,19 +94,18 @@ def extract_prices(client, text):
 
     user_prompt = f"Extract JSON data from this text:\n{text}"
 
-    while True:
-        try:
-            response = client.chat(
-                model=OLLAMA_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-            
-            return json.loads(response.message.content.strip())
-        except json.JSONDecodeError:
-            continue
+    def call():
+        response = client.chat(
+            model=OLLAMA_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        )
+        return json.loads(response.message.content.strip())
+
+    return LLM_RETRY.call(call, name="extract_prices", breaker=LLM_BREAKER,
+                          breaker_exempt=(json.JSONDecodeError,))
 
 def price_summary(data):
     return "\n".join([
@@ -84,7 +120,7 @@ def price_summary(data):
         f"📅 Date: {data.get('date_jalali')}"
     ])
 
-def generate_invest_advice(client, prices):
+def generate_invest_advice(client, prices, history=None):
     system_prompt = """
         You are an experienced financial advisor. 
         Provide a short, professional investment advice in English based on 
@@ -99,20 +135,23 @@ def generate_invest_advice(client, prices):
     """
 
     user_prompt = f"Here are the current prices in JSON:\n{json.dumps(prices)}"
-
-    while True:
-        try:
-            response = client.chat(
-                model=OLLAMA_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-            
-            return response.message.content.strip()
-        except Exception:
-            continue
+    if history:
+        user_prompt += (
+            "\n\nRecent history (moving averages, % changes, volatility, "
+            f"and coin premium over ounce x tether) in JSON:\n{json.dumps(history)}"
+        )
+
+    def call():
+        response = client.chat(
+            model=OLLAMA_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        )
+        return response.message.content.strip()
+
+    return LLM_RETRY.call(call, name="generate_invest_advice", breaker=LLM_BREAKER)
 
 def main():
     try:
@@ -123,12 +162,20 @@ def main():
         summary = price_summary(prices)    
         print(summary)
 
-        advice = generate_invest_advice(client, prices)
+        store = PriceStore()
+        store.append(prices)
+        history = summarize(store)
+
+        advice = generate_invest_advice(client, prices, history)
         print("\n💡 Investment Advice:")
         print(advice)   
     except Exception as e:
         print("Error:", e)
         return
+    finally:
+        if LLM_RETRY.history:
+            print("\n⏱️ LLM calls:")
+            print(LLM_RETRY.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+import re
+
+PERSIAN_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩٬٫", "01234567890123456789,.")
+
+# Checked in this order on every line, so "نیم سکه بهار آزادی" is a half coin
+# and not a Bahar Azadi coin.
+FIELD_KEYWORDS = [
+    ("half_toman", ["نیم سکه", "نیم‌سکه"]),
+    ("quarter_toman", ["ربع سکه", "ربع‌سکه"]),
+    ("gold_18k_toman", ["طلای 18 عیار", "طلا 18 عیار", "18 عیار"]),
+    ("emami_toman", ["سکه امامی", "امامی"]),
+    ("bahar_azadi_toman", ["سکه بهار آزادی", "بهار آزادی"]),
+    ("ounce_usd", ["اونس طلا", "انس طلا", "اونس جهانی", "اونس", "انس"]),
+    ("tether_toman", ["تتر", "USDT"]),
+]
+PRICE_FIELDS = [field for field, _ in FIELD_KEYWORDS]
+SCHEMA_FIELDS = [
+    "gold_18k_toman", "tether_toman", "bahar_azadi_toman", "emami_toman",
+    "half_toman", "quarter_toman", "ounce_usd", "time_24h", "date_jalali",
+]
+
+NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+TIME = re.compile(r"(?<!\d)([01]?\d|2[0-3]):([0-5]\d)(?!\d)")
+DATE = re.compile(r"(1[34]\d\d)\s*[/\-.]\s*(\d{1,2})\s*[/\-.]\s*(\d{1,2})")
+JALALI_MONTHS = {
+    "فروردین": 1, "اردیبهشت": 2, "خرداد": 3, "تیر": 4, "مرداد": 5, "شهریور": 6,
+    "مهر": 7, "آبان": 8, "آذر": 9, "دی": 10, "بهمن": 11, "اسفند": 12,
+}
+SCALES = {"میلیارد": 1_000_000_000, "میلیون": 1_000_000, "هزار": 1_000}
+SCALE_WORD = re.compile(r"\s*(" + "|".join(SCALES) + ")")
+AND_NUMBER = re.compile(r"\s*و\s*(?=\d)")
+
+# Plausible ranges (Toman, ounce in USD). A value outside its range, or coins
+# out of the emami > half > quarter order, is kept but makes the parse
+# suspect, which sends the bulletin to the LLM instead.
+PLAUSIBLE_RANGES = {
+    "gold_18k_toman": (500_000, 200_000_000),
+    "emami_toman": (5_000_000, 2_000_000_000),
+    "bahar_azadi_toman": (5_000_000, 2_000_000_000),
+    "half_toman": (2_000_000, 1_000_000_000),
+    "quarter_toman": (1_000_000, 500_000_000),
+    "tether_toman": (10_000, 2_000_000),
+    "ounce_usd": (500, 20_000),
+}
+SUSPECT_CONFIDENCE = 0.5
+
+DATE_WORDS = re.compile(r"(\d{1,2})\s*(" + "|".join(JALALI_MONTHS) + r")\s*(1[34]\d\d)")
+
+
+def normalize(text):
+    """Persian/Arabic digits and separators to ASCII, unify Arabic letters"""
+    return text.translate(PERSIAN_DIGITS).replace("ي", "ی").replace("ك", "ک")
+
+
+def _parse_amount(line, start):
+    """Number after position start in line, converted from Rial.
+
+    Handles scale words, including compound amounts such as
+    "۵۶ میلیون و ۲۰۰ هزار" (56,200,000).
+    """
+    match = NUMBER.search(line, start)
+    if not match:
+        return None
+    value = 0.0
+    while match:
+        part = float(match.group().replace(",", ""))
+        unit = SCALE_WORD.match(line, match.end())
+        if not unit:
+            value += part
+            break
+        value += part * SCALES[unit.group(1)]
+        # "... میلیون و ۲۰۰ هزار": another component follows after "و".
+        joint = AND_NUMBER.match(line, unit.end())
+        match = NUMBER.match(line, joint.end()) if joint else None
+    if "ریال" in line and "تومان" not in line:
+        value /= 10
+    return value
+
+
+def _format(value, decimals=0):
+    return f"{value:,.{decimals}f}"
+
+
+def parse_prices(text):
+    """Extract the extract_prices JSON fields with keyword-anchored regexes.
+
+    Returns (data, confidence). confidence is the share of price fields found,
+    from 0.0 to 1.0, capped at SUSPECT_CONFIDENCE when any value fails the
+    range or coin-order checks.
+    """
+    lines = [line.strip() for line in normalize(text).splitlines() if line.strip()]
+    values = {}
+    for i, line in enumerate(lines):
+        for field, keywords in FIELD_KEYWORDS:
+            if field in values:
+                continue
+            hit = next((line.find(k) + len(k) for k in keywords if k in line), None)
+            if hit is None:
+                continue
+            value = _parse_amount(line, hit)
+            if value is None and i + 1 < len(lines):
+                value = _parse_amount(lines[i + 1], 0)
+            if value:
+                values[field] = value
+            break
+
+    suspect = {field for field, value in values.items()
+               if not PLAUSIBLE_RANGES[field][0] <= value <= PLAUSIBLE_RANGES[field][1]}
+    # Coins are priced emami > half > quarter. Without knowing which side is
+    # wrong, a broken order marks both.
+    for small, big in (("quarter_toman", "half_toman"), ("half_toman", "emami_toman")):
+        if small in values and big in values and values[small] >= values[big]:
+            suspect.update((small, big))
+
+    data = {field: None for field in SCHEMA_FIELDS}
+    for field, value in values.items():
+        data[field] = _format(value, 2 if field == "ounce_usd" and value % 1 else 0)
+
+    normalized = normalize(text)
+    time_match = TIME.search(normalized)
+    data["time_24h"] = f"{int(time_match.group(1)):02d}:{time_match.group(2)}" if time_match else None
+    date_match = DATE.search(normalized)
+    if date_match:
+        year, month, day = date_match.groups()
+        data["date_jalali"] = f"{year}/{int(month):02d}/{int(day):02d}"
+    else:
+        words_match = DATE_WORDS.search(normalized)
+        data["date_jalali"] = (
+            f"{words_match.group(3)}/{JALALI_MONTHS[words_match.group(2)]:02d}/{int(words_match.group(1)):02d}"
+            if words_match else None
+        )
+
+    confidence = len(values) / len(PRICE_FIELDS)
+    return data, min(confidence, SUSPECT_CONFIDENCE) if suspect else confidence
@@ -0,0 +1,136 @@
+# Append-only price history.
+#
+# One fixed-size binary record per bulletin: a UTC timestamp (int64 seconds)
+# followed by the seven prices as float64 (NaN when missing) - 64 bytes per
+# row, so a year of minute-level data is about 34 MB. The file is read back
+# through a NumPy memory map and range queries are binary searches on the
+# (sorted) timestamp column.
+
+import datetime
+import os
+
+import numpy as np
+
+PRICE_COLUMNS = [
+    "gold_18k_toman", "tether_toman", "bahar_azadi_toman", "emami_toman",
+    "half_toman", "quarter_toman", "ounce_usd",
+]
+RECORD = np.dtype([("ts", "<i8")] + [(name, "<f8") for name in PRICE_COLUMNS])
+STORE_PATH = "prices.bin"
+
+# Iran has used a fixed UTC+03:30 offset since 2022.
+TEHRAN = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+
+
+def jalali_to_gregorian(jy, jm, jd):
+    """Convert a Jalali (Solar Hijri) date to a Gregorian (year, month, day)"""
+    jy += 1595
+    days = -355668 + 365 * jy + (jy // 33) * 8 + ((jy % 33) + 3) // 4 + jd
+    days += (jm - 1) * 31 if jm < 7 else (jm - 7) * 30 + 186
+    gy = 400 * (days // 146097)
+    days %= 146097
+    if days > 36524:
+        days -= 1
+        gy += 100 * (days // 36524)
+        days %= 36524
+        if days >= 365:
+            days += 1
+    gy += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        gy += (days - 1) // 365
+        days = (days - 1) % 365
+    gd = days + 1
+    leap = (gy % 4 == 0 and gy % 100 != 0) or gy % 400 == 0
+    month_days = [0, 31, 29 if leap else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    gm = 1
+    while gm <= 12 and gd > month_days[gm]:
+        gd -= month_days[gm]
+        gm += 1
+    return gy, gm, gd
+
+
+def gregorian_to_jalali(gy, gm, gd):
+    """Convert a Gregorian date to a Jalali (year, month, day)"""
+    g_days = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+    gy2 = gy + 1 if gm > 2 else gy
+    days = 355666 + 365 * gy + (gy2 + 3) // 4 - (gy2 + 99) // 100 + (gy2 + 399) // 400 + gd + g_days[gm - 1]
+    jy = -1595 + 33 * (days // 12053)
+    days %= 12053
+    jy += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        jy += (days - 1) // 365
+        days = (days - 1) % 365
+    if days < 186:
+        return jy, 1 + days // 31, 1 + days % 31
+    return jy, 7 + (days - 186) // 30, 1 + (days - 186) % 30
+
+
+def bulletin_timestamp(prices, default=None):
+    """UTC epoch seconds of a bulletin from its date_jalali and time_24h fields"""
+    try:
+        jy, jm, jd = (int(part) for part in prices["date_jalali"].split("/"))
+        hour, minute = (int(part) for part in (prices.get("time_24h") or "00:00").split(":"))
+        moment = datetime.datetime(*jalali_to_gregorian(jy, jm, jd), hour, minute, tzinfo=TEHRAN)
+        return int(moment.timestamp())
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return int(default if default is not None else datetime.datetime.now(datetime.timezone.utc).timestamp())
+
+
+def to_jalali(ts):
+    """Tehran-time Jalali date and time string for a UTC epoch timestamp"""
+    moment = datetime.datetime.fromtimestamp(int(ts), TEHRAN)
+    jy, jm, jd = gregorian_to_jalali(moment.year, moment.month, moment.day)
+    return f"{jy}/{jm:02d}/{jd:02d} {moment:%H:%M}"
+
+
+def parse_number(value):
+    """'9,854,000' -> 9854000.0; missing or malformed -> NaN"""
+    try:
+        return float(str(value).replace(",", "")) if value is not None else np.nan
+    except ValueError:
+        return np.nan
+
+
+class PriceStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+
+    def __len__(self):
+        return os.path.getsize(self.path) // RECORD.itemsize if os.path.exists(self.path) else 0
+
+    def data(self):
+        """All records as a read-only memory-mapped structured array"""
+        if len(self) == 0:
+            return np.zeros(0, dtype=RECORD)
+        return np.memmap(self.path, dtype=RECORD, mode="r", shape=(len(self),))
+
+    def last_timestamp(self):
+        n = len(self)
+        if n == 0:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek((n - 1) * RECORD.itemsize)
+            return int(np.frombuffer(f.read(RECORD.itemsize), dtype=RECORD)[0]["ts"])
+
+    def append(self, prices, ts=None):
+        """Append one extract_prices() result; returns False for a duplicate or out-of-order bulletin"""
+        ts = bulletin_timestamp(prices) if ts is None else int(ts)
+        last = self.last_timestamp()
+        if last is not None and ts <= last:
+            return False
+        record = np.zeros(1, dtype=RECORD)
+        record["ts"] = ts
+        for name in PRICE_COLUMNS:
+            record[name] = parse_number(prices.get(name))
+        with open(self.path, "ab") as f:
+            f.write(record.tobytes())
+        return True
+
+    def range(self, start=None, end=None):
+        """Records with start <= ts < end (UTC epoch seconds), found by binary search"""
+        data = self.data()
+        lo = 0 if start is None else int(np.searchsorted(data["ts"], start, side="left"))
+        hi = len(data) if end is None else int(np.searchsorted(data["ts"], end, side="left"))
+        return data[lo:hi]
@@ -0,0 +1,119 @@
+import random
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the service while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail immediately. After reset_timeout seconds one trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        if self.state == "open":
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise CircuitOpenError(f"Circuit open after {self.failures} failures, retry in {remaining:.0f}s")
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff, full jitter and an overall deadline.
+
+    The last history_size calls are kept in self.history as
+    {"name", "attempts", "seconds", "ok", "error"}; self.totals counts every
+    call, so a long-running process does not grow without bound.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=20.0, deadline=90.0, history_size=100):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.history = deque(maxlen=history_size)
+        self.totals = {"calls": 0, "failed": 0, "attempts": 0, "seconds": 0.0}
+
+    def backoff(self, attempt):
+        """Random delay in [0, min(max_delay, base_delay * 2^attempt)]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, func, name="call", breaker=None, retry_on=(Exception,), breaker_exempt=()):
+        """Call func with retries.
+
+        Errors in breaker_exempt (e.g. a malformed reply from a healthy
+        service) are retried but do not count toward the circuit breaker.
+        """
+        start = time.monotonic()
+        attempts = 0
+        record = {"name": name, "attempts": 0, "seconds": 0.0, "ok": False, "error": None}
+        self.history.append(record)
+        try:
+            while True:
+                if breaker:
+                    breaker.before_call()
+                attempts += 1
+                record["attempts"] = attempts
+                try:
+                    result = func()
+                except retry_on as e:
+                    if breaker and not isinstance(e, breaker_exempt):
+                        breaker.record_failure()
+                    delay = self.backoff(attempts - 1)
+                    elapsed = time.monotonic() - start
+                    if attempts >= self.max_attempts or elapsed + delay > self.deadline:
+                        raise
+                    print(f"⚠️ {name} failed (attempt {attempts}/{self.max_attempts}): {e}; retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                if breaker:
+                    breaker.record_success()
+                record["ok"] = True
+                return result
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            record["seconds"] = round(time.monotonic() - start, 3)
+            self.totals["calls"] += 1
+            self.totals["failed"] += not record["ok"]
+            self.totals["attempts"] += attempts
+            self.totals["seconds"] += record["seconds"]
+
+    def summary(self):
+        """One line per recent call, plus totals when older calls were dropped"""
+        lines = [
+            f"{r['name']}: {'ok' if r['ok'] else 'failed'} after {r['attempts']} attempt(s) in {r['seconds']}s"
+            for r in self.history
+        ]
+        t = self.totals
+        if t["calls"] > len(self.history):
+            lines.append(f"total: {t['calls']} call(s), {t['failed']} failed, "
+                         f"{t['attempts']} attempt(s) in {t['seconds']:.1f}s")
+        return "\n".join(lines)
@@ -0,0 +1,149 @@
+# Long-running watcher for the price channel.
+#
+#   python watcher.py --interval 60     # poll forever
+#   python watcher.py --once            # one cheap check, e.g. from cron
+#
+# Only posts newer than the last processed one are parsed, and prices are
+# only extracted (and advice generated) when a new price post appears. The
+# last post id and the HTTP validators are kept in watcher_state.json.
+
+import argparse
+import json
+import os
+import time
+
+import requests
+
+from analytics import summarize
+from fast_html import POST_ID, iter_posts_reversed
+from price import (
+    CHANNEL_USERNAME, OLLAMA_API_KEY, PRICE_MATCHER, create_client,
+    extract_prices, generate_invest_advice, price_summary,
+)
+from price_store import PriceStore
+
+STATE_PATH = "watcher_state.json"
+
+
+def load_state(path=STATE_PATH):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"last_post_id": 0, "etag": None, "last_modified": None}
+
+
+def save_state(state, path=STATE_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def create_session():
+    """Keep-alive session reused for every poll"""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    return session
+
+
+def fetch_new_html(session, username, state):
+    """Fetch posts after the last processed one.
+
+    Returns (html, validators), or (None, None) if the page did not change.
+    The validators are not written to state here: the caller commits them
+    together with last_post_id once the new posts were handled.
+    """
+    url = f"https://t.me/s/{username}"
+    params = {"after": state["last_post_id"]} if state["last_post_id"] else None
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    response = session.get(url, params=params, headers=headers, timeout=20)
+    if response.status_code == 304:
+        return None, None
+    response.raise_for_status()
+    validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    return response.text, validators
+
+
+def newest_post_id(html):
+    """Highest post id on the page, found with a regex instead of parsing"""
+    return max((int(i) for i in POST_ID.findall(html)), default=0)
+
+
+def find_new_price_posts(html, last_post_id):
+    """Return [(post_id, text)] of price posts newer than last_post_id, oldest first"""
+    # Cheap check before scanning any text: is there a newer post at all?
+    if newest_post_id(html) <= last_post_id:
+        return []
+
+    posts = []
+    for post_id, text in iter_posts_reversed(html):
+        if post_id is not None and post_id <= last_post_id:
+            break
+        if post_id is not None and PRICE_MATCHER.search(text):
+            posts.append((post_id, text))
+    return sorted(posts)
+
+
+def check_once(session, client, store, state, with_advice=True):
+    """Process every unseen price post, oldest first; return True if there was one"""
+    html, validators = fetch_new_html(session, CHANNEL_USERNAME, state)
+    if html is None:
+        return False
+
+    posts = find_new_price_posts(html, state["last_post_id"])
+    for post_id, text in posts:
+        prices = extract_prices(client, text)
+        print(f"\n🆕 Post {post_id}")
+        print(price_summary(prices))
+        store.append(prices)
+        if with_advice and post_id == posts[-1][0]:
+            print("\n💡 Investment Advice:")
+            print(generate_invest_advice(client, prices, summarize(store)))
+        # Advance post by post, so a failure retries only the posts not yet handled.
+        state["last_post_id"] = post_id
+
+    # Everything on the page was handled: now the validators may be committed,
+    # so the next poll can get a 304.
+    state["last_post_id"] = max(state["last_post_id"], newest_post_id(html))
+    state.update(validators)
+    return bool(posts)
+
+
+def watch(interval=60, once=False, with_advice=True, state_path=STATE_PATH):
+    state = load_state(state_path)
+    session = create_session()
+    client = create_client(OLLAMA_API_KEY)
+    store = PriceStore()
+    print(f"👀 Watching t.me/s/{CHANNEL_USERNAME} (last post {state['last_post_id']})")
+
+    while True:
+        start = time.monotonic()
+        try:
+            if not check_once(session, client, store, state, with_advice):
+                print(f"💤 No new price posts ({time.strftime('%H:%M:%S')})")
+        except Exception as e:
+            print("Error:", e)
+        finally:
+            # Also after an error: posts handled before it must not be redone.
+            save_state(state, state_path)
+        if once:
+            return
+        time.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch the price channel for new posts")
+    parser.add_argument("--interval", type=float, default=60, help="seconds between polls")
+    parser.add_argument("--once", action="store_true", help="check once and exit")
+    parser.add_argument("--no-advice", action="store_true", help="only print prices")
+    args = parser.parse_args()
+
+    try:
+        watch(args.interval, args.once, not args.no_advice)
+    except KeyboardInterrupt:
+        print("👋 Bye!")
@@ -1,26 +1,43 @@
 import os
-import requests
+import time
+
 from ollama import Client
 from dotenv import load_dotenv
 
+from tools import ToolRegistry
+from weather import WeatherClient
+
 load_dotenv()
 
 API_KEY = os.getenv("OLLAMA_API_KEY")
 MODEL = os.getenv("OLLAMA_MODEL")
 
 
+registry = ToolRegistry()
+weather = WeatherClient(cache_path=os.getenv("WEATHER_CACHE_PATH"))
+
+
+@registry.tool
 def get_current_weather(city: str) -> str:
-    """Get the current weather in a given city"""
-    base_url = f"https://wttr.in/{city}?format=j1"
-    response = requests.get(base_url)
-    data = response.json()
-    return f"The current temperature in {city} is: {data['current_condition'][0]['temp_C']}°C"
+    """Get the current weather in a given city
 
+    Args:
+        city: The city to get the weather for
+    """
+    return f"The current temperature in {city} is: {weather.current_temperature(city)}°C"
 
-def create_text_file(filename: str, content: str):
-    """Create a text file with the given content"""
+
+@registry.tool
+def create_text_file(filename: str, content: str) -> str:
+    """Create a text file with the given content
+
+    Args:
+        filename: The name of the file to create
+        content: The content to write in the file
+    """
     with open(filename, "w", encoding="utf-8") as file:
         file.write(content)
+    return f"📝 File Created: {filename}"
 
 client = Client(
     host="https://ollama.com",
@@ -29,12 +46,15 @@ client = Client(
     }
 )
 
+SYSTEM_PROMPT = "You are an intelligent assistant that can use available functions to provide more accurate answers."
+
+
 def aks_ollama(prompt: str) -> str:
     """Send a message to the Ollama model to detect tool usage"""
     messages = [
         {
             "role": "system",
-            "content": "You are an intelligent assistant that can use available functions to provide more accurate answers.",
+            "content": SYSTEM_PROMPT,
         },
         {
             "role": "user",
@@ -42,52 +62,11 @@ def aks_ollama(prompt: str) -> str:
         },
     ]
 
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "get_current_weather",
-                "description": "Get the current weather in a given city",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "city": {
-                            "type": "string",
-                            "description": "The city to get the weather for",
-                        },
-                    },
-                    "required": ["city"],
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "create_text_file",
-                "description": "Create a text file with the given content",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "filename": {
-                            "type": "string",
-                            "description": "The name of the file to create",
-                        },
-                        "content": {
-                            "type": "string",
-                            "description": "The content to write in the file",
-                        },
-                    },
-                    "required": ["filename", "content"],
-                },
-            },
-        },
-    ]
-
     try:
         result = client.chat(
             model=MODEL,
             messages=messages,
-            tools=tools,
+            tools=registry.schemas,
         )
     except Exception as e:
         return f"Error: {e}"
@@ -95,32 +74,33 @@ def aks_ollama(prompt: str) -> str:
     return result
     
 
-def chat(prompt: str) -> str:
-    """Send a message to the Ollama model and return the response"""
+def chat(prompt: str) -> list:
+    """Send a message to the Ollama model and run the requested tools concurrently"""
     response = aks_ollama(prompt)
-    
+    if isinstance(response, str):
+        print(response)
+        return []
+
     tools_calls = response.message.tool_calls
-    # print(tools_calls)
-
-    if tools_calls:
-        for tool_call in tools_calls:
-            function_name = tool_call.function.name
-            print(function_name)
-            arguments = tool_call.function.arguments
-            print(arguments)
-
-            if function_name == "get_current_weather":
-                city = arguments.get("city")
-                weather = get_current_weather(city)
-                print(f"🔍 Weather Result: {weather}")
-
-            elif function_name == "create_text_file":
-                filename = arguments.get("filename")
-                content = arguments.get("content")
-                create_text_file(filename, content)
-                print(f"📝 File Created: {filename}")
-
-# Test    
-chat("What is the weather in Tehran?")
-chat("Create a file named 'test.txt' with the content 'Hello, World!'")
-chat("Create a file named 'paris.txt' with the content about Paris")
\ No newline at end of file
+    if not tools_calls:
+        print(response.message.content)
+        return []
+
+    start = time.perf_counter()
+    results = registry.run_tool_calls(tools_calls)
+    for call in results:
+        print(call["name"], call["arguments"])
+        if call["error"]:
+            print(f"❌ {call['name']} failed: {call['error']}")
+        else:
+            print(f"✅ {call['result']}")
+    print(f"⏱️ {len(results)} tool call(s) in {time.perf_counter() - start:.2f}s")
+    return results
+
+
+if __name__ == "__main__":
+    # Test    
+    chat("What is the weather in Tehran?")
+    chat("What is the weather in Tehran, Paris, Tokyo, London and New York?")
+    chat("Create a file named 'test.txt' with the content 'Hello, World!'")
+    chat("Create a file named 'paris.txt' with the content about Paris")
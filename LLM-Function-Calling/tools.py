@@ -0,0 +1,163 @@
+# Tool registry for Ollama function calling.
+#
+# Functions are registered with @registry.tool. Their JSON schemas are built
+# once from the signature and docstring and cached, tool calls are dispatched
+# by name lookup, and all tool calls of one model response run concurrently:
+# blocking tools in a thread pool, async tools on an event loop, each with its
+# own timeout.
+
+import asyncio
+import inspect
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+DEFAULT_TIMEOUT = 20
+MAX_WORKERS = 8
+
+class ToolError(RuntimeError):
+    """A tool call failed, timed out or named an unknown tool"""
+
+
+JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", list: "array", dict: "object"}
+
+
+def _json_type(annotation):
+    origin = typing.get_origin(annotation) or annotation
+    if origin is typing.Union:
+        # Optional[X] -> X
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _json_type(args[0]) if len(args) == 1 else "string"
+    return JSON_TYPES.get(origin, "string")
+
+
+def _parse_docstring(doc):
+    """Split a docstring into its summary and an {arg: description} map from an Args: section"""
+    summary, params = [], {}
+    section = None
+    for line in inspect.cleandoc(doc or "").splitlines():
+        stripped = line.strip()
+        if stripped in ("Args:", "Arguments:", "Parameters:"):
+            section = "args"
+        elif stripped.endswith(":") and " " not in stripped:
+            section = "other"
+        elif section == "args" and ":" in stripped:
+            name, description = stripped.split(":", 1)
+            params[name.split("(")[0].strip()] = description.strip()
+        elif section is None and stripped:
+            summary.append(stripped)
+    return " ".join(summary), params
+
+
+def function_schema(func, name=None):
+    """Ollama/OpenAI tool schema derived from a function's signature and docstring"""
+    description, param_docs = _parse_docstring(func.__doc__)
+    hints = typing.get_type_hints(func)
+    properties, required = {}, []
+    for param in inspect.signature(func).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        prop = {"type": _json_type(hints.get(param.name, str))}
+        if param.name in param_docs:
+            prop["description"] = param_docs[param.name]
+        properties[param.name] = prop
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+    return {
+        "type": "function",
+        "function": {
+            "name": name or func.__name__,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties, "required": required},
+        },
+    }
+
+
+class ToolRegistry:
+    def __init__(self, max_workers=MAX_WORKERS, default_timeout=DEFAULT_TIMEOUT):
+        self.functions = {}
+        self.timeouts = {}
+        self._schemas = {}
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def tool(self, func=None, *, name=None, timeout=None):
+        """Decorator registering a function (sync or async) as a tool"""
+        def register(f):
+            tool_name = name or f.__name__
+            self.functions[tool_name] = f
+            self.timeouts[tool_name] = timeout or self.default_timeout
+            self._schemas[tool_name] = function_schema(f, tool_name)
+            return f
+        return register(func) if func is not None else register
+
+    @property
+    def schemas(self):
+        """Cached tool schemas, ready to pass as tools= to client.chat"""
+        return list(self._schemas.values())
+
+    def _event_loop(self):
+        """Background event loop shared by all async tools"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="tool-loop", daemon=True).start()
+            return self._loop
+
+    def _submit(self, name, arguments):
+        func = self.functions[name]
+        if inspect.iscoroutinefunction(func):
+            coroutine = asyncio.wait_for(func(**arguments), self.timeouts[name])
+            return asyncio.run_coroutine_threadsafe(coroutine, self._event_loop())
+        return self._executor.submit(func, **arguments)
+
+    def call(self, name, arguments):
+        """Run a single tool call and return its result; raises ToolError if it failed"""
+        outcome = self.run_all([(name, arguments)])[0]
+        if outcome["error"] is not None:
+            raise ToolError(f"{name}: {outcome['error']}")
+        return outcome["result"]
+
+    def run_all(self, calls):
+        """Run [(name, arguments)] concurrently; return [{name, arguments, result, error, seconds}] in order"""
+        start = time.perf_counter()
+        submitted = []
+        for name, arguments in calls:
+            arguments = dict(arguments or {})
+            if name not in self.functions:
+                submitted.append((name, arguments, None, f"Unknown tool: {name}"))
+                continue
+            try:
+                submitted.append((name, arguments, self._submit(name, arguments), None))
+            except Exception as e:
+                submitted.append((name, arguments, None, str(e)))
+
+        results = []
+        for name, arguments, future, error in submitted:
+            result = None
+            if future is not None:
+                # Every call started at `start`, so each waits only for what is left of its own budget.
+                remaining = self.timeouts[name] - (time.perf_counter() - start)
+                try:
+                    result = future.result(timeout=max(0.0, remaining))
+                except (FutureTimeout, asyncio.TimeoutError):
+                    future.cancel()
+                    error = f"Timed out after {self.timeouts[name]}s"
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+            results.append({
+                "name": name,
+                "arguments": arguments,
+                "result": result,
+                "error": error,
+                "seconds": round(time.perf_counter() - start, 3),
+            })
+        return results
+
+    def run_tool_calls(self, tool_calls):
+        """Run the tool_calls of an Ollama chat response concurrently"""
+        return self.run_all([(call.function.name, call.function.arguments) for call in tool_calls or []])
@@ -0,0 +1,131 @@
+# Cached weather lookups for get_current_weather.
+#
+# One pooled keep-alive session is shared by all tool calls, results are kept
+# per city in an in-memory LRU with a TTL (optionally persisted to a JSON
+# file), and concurrent lookups for the same city wait on a single in-flight
+# request instead of each fetching it.
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+WTTR_URL = "https://wttr.in"
+CACHE_TTL = 600
+CACHE_SIZE = 256
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+POOL_SIZE = 8
+
+
+def create_session(pool_size=POOL_SIZE):
+    """Keep-alive session with a connection pool sized for concurrent tool calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": "curl/8", "Accept": "application/json"})
+    return session
+
+
+class WeatherClient:
+    def __init__(self, base_url=None, ttl=CACHE_TTL, max_size=CACHE_SIZE, cache_path=None, session=None):
+        # WTTR_URL in the environment points the client at a local stub server.
+        self.base_url = (base_url or os.getenv("WTTR_URL") or WTTR_URL).rstrip("/")
+        self.ttl = ttl
+        self.max_size = max_size
+        self.cache_path = cache_path
+        self.session = session or create_session()
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self._cache = OrderedDict()  # city key -> (fetched_at, data)
+        self._in_flight = {}  # city key -> Future
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = 0
+        self._load()
+
+    @staticmethod
+    def _key(city):
+        return " ".join(city.split()).lower()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (fetched_at, data) in entries.items():
+            if now - fetched_at < self.ttl:
+                self._cache[key] = (fetched_at, data)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        # Snapshot and write under one lock so an older snapshot never replaces a newer file.
+        with self._save_lock:
+            with self._lock:
+                entries = dict(self._cache)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+
+    def _fetch(self, city):
+        response = self.session.get(f"{self.base_url}/{quote(city)}", params={"format": "j1"}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get(self, city):
+        """wttr.in j1 data for a city, from the cache when fresh"""
+        key = self._key(city)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and time.time() - entry[0] < self.ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._fetch(city)
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._cache[key] = (time.time(), data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+            del self._in_flight[key]
+        future.set_result(data)
+        self._save()
+        return data
+
+    def current_temperature(self, city):
+        return self.get(city)["current_condition"][0]["temp_C"]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "cached": len(self._cache)}
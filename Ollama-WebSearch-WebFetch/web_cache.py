@@ -0,0 +1,145 @@
+# Caching wrapper around Client.web_search and Client.web_fetch.
+#
+# Responses are stored zlib-compressed in a small SQLite database keyed by
+# the call type and its arguments, each call type with its own TTL. The
+# total size is bounded: past max_bytes, the least recently used entries are
+# evicted. Concurrent identical requests share one in-flight API call.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+
+from ollama import WebFetchResponse, WebSearchResponse
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "youtube-tutorials", "ollama_web.sqlite")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTLS = {"search": 3600, "fetch": 24 * 3600}
+RESPONSE_TYPES = {"search": WebSearchResponse, "fetch": WebFetchResponse}
+
+
+class CachedWebClient:
+    """Drop-in for client.web_search / client.web_fetch with an on-disk cache"""
+
+    def __init__(self, client, path=DEFAULT_CACHE_PATH, ttls=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.client = client
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._in_flight = {}
+        self.counters = {kind: {"hits": 0, "misses": 0, "coalesced": 0} for kind in DEFAULT_TTLS}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, kind TEXT, body BLOB, size INTEGER, created REAL, last_used REAL);
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+        """)
+
+    @staticmethod
+    def _key(kind, args):
+        raw = json.dumps([kind, args], sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _lookup(self, key, kind):
+        row = self.conn.execute("SELECT body, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        if time.time() - row[1] >= self.ttls[kind]:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def _store(self, key, kind, data):
+        body = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, body, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, body, len(body), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def _call(self, kind, args, remote):
+        key = self._key(kind, args)
+        counters = self.counters[kind]
+        with self.lock:
+            data = self._lookup(key, kind)
+            if data is not None:
+                counters["hits"] += 1
+                return RESPONSE_TYPES[kind].model_validate(data)
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                counters["misses"] += 1
+            else:
+                counters["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            response = remote(**args)
+        except Exception as e:
+            with self.lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self._store(key, kind, response.model_dump())
+            del self._in_flight[key]
+        future.set_result(response)
+        return response
+
+    def web_search(self, query: str, max_results: int = 3):
+        return self._call("search", {"query": query, "max_results": max_results}, self.client.web_search)
+
+    def web_fetch(self, url: str):
+        return self._call("fetch", {"url": url}, self.client.web_fetch)
+
+    def stats(self):
+        """Hit/miss counters per call type, plus cache size"""
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            stats = {kind: dict(c) for kind, c in self.counters.items()}
+        for c in stats.values():
+            calls = c["hits"] + c["misses"] + c["coalesced"]
+            c["saved_calls"] = c["hits"] + c["coalesced"]
+            c["hit_rate"] = round(c["saved_calls"] / calls, 3) if calls else None
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+    def report(self):
+        stats = self.stats()
+        for kind in DEFAULT_TTLS:
+            c = stats[kind]
+            print(f"📦 web_{kind}: {c['hits']} hits, {c['coalesced']} coalesced, {c['misses']} remote calls")
+        print(f"   {stats['entries']} cached responses, {stats['bytes'] / 1024:.1f} KB on disk")
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
@@ -2,6 +2,8 @@ from ollama import Client
 import os
 from dotenv import load_dotenv
 
+from web_cache import CachedWebClient
+
 load_dotenv()
 
 API_KEY = os.getenv("API_KEY")
@@ -10,11 +12,14 @@ try:
     client = Client(
         headers={'Authorization': f'Bearer {API_KEY}'}
     )
+    # Repeated queries/URLs are answered from the on-disk cache
+    web = CachedWebClient(client)
 
-    response = client.web_fetch("https://docs.ollama.com/")
+    response = web.web_fetch("https://docs.ollama.com/")
     print(response.get('title', 'No title'))
     print(response.get('content', 'No content available')[:200])
     print(response.get('links', 'No links'))
+    web.report()
 
 except Exception as e:
     print(f"Error: {e}")
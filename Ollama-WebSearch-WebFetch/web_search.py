@@ -2,6 +2,8 @@ from ollama import Client
 import os
 from dotenv import load_dotenv
 
+from web_cache import CachedWebClient
+
 load_dotenv()
 
 API_KEY = os.getenv("API_KEY")
@@ -10,8 +12,10 @@ try:
     client = Client(
         headers={'Authorization': f'Bearer {API_KEY}'}
     )
+    # Repeated queries/URLs are answered from the on-disk cache
+    web = CachedWebClient(client)
 
-    response = client.web_search(
+    response = web.web_search(
         query="What is the capital of France?",
         max_results=3
     )
@@ -30,6 +34,7 @@ try:
             print('-' * 40)
     else:
         print("No results found.")
+    web.report()
 except Exception as e:
     print(f"Error: {e}")
     
\ No newline at end of file
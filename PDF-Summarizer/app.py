@@ -1,13 +1,29 @@
 # Required libraries installation:
 # pip install ollama pypdf2 python-docx
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import PyPDF2
 from docx import Document
 from ollama import Client
 
+from page_cache import cached_pages
+
 OLLAMA_MODEL = "gpt-oss:120b-cloud"
 OLLAMA_API_KEY = "***"
 
+# Texts longer than this (estimated tokens) are summarized with map-reduce.
+SECTION_TOKENS = 3000
+MAX_WORKERS = 4
+# Attempts per map-reduce call before the whole summary fails.
+SECTION_ATTEMPTS = 3
+
+
+class SummaryError(RuntimeError):
+    """A summarization call still failed after retries"""
+
+
 def ask_ollama(client, prompt):
     try:
         response = client.chat(
@@ -28,22 +44,100 @@ def create_client(api_key):
     )
 
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+def extract_pdf_pages(file_path):
+    """Extract the text of each PDF page, one page at a time"""
     with open(file_path, "rb") as f:
         reader = PyPDF2.PdfReader(f)
-        text = ""
         for page in reader.pages:
-            text += page.extract_text() + "\n"
-    return text
+            yield page.extract_text() or ""
+
+def iter_pdf_pages(file_path):
+    """Yield the text of each PDF page, from the page cache if this file was extracted before"""
+    return cached_pages(file_path, extract_pdf_pages)
+
+def extract_text_from_pdf(file_path):
+    """Extract text from PDF file"""
+    return "".join(page + "\n" for page in iter_pdf_pages(file_path))
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+def split_into_sections(text, max_tokens=SECTION_TOKENS):
+    """Split text on line boundaries into sections of at most max_tokens"""
+    sections = []
+    current = []
+    current_tokens = 0
+    for line in text.splitlines():
+        line_tokens = estimate_tokens(line)
+        # A single over-long line is cut into pieces that fit.
+        pieces = [line] if line_tokens <= max_tokens else [
+            line[i:i + max_tokens * 4] for i in range(0, len(line), max_tokens * 4)
+        ]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                sections.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        sections.append("\n".join(current))
+    return sections
+
+def ask_ollama_or_raise(client, prompt, attempts=SECTION_ATTEMPTS):
+    """ask_ollama with retries; raises SummaryError instead of returning an error string"""
+    for attempt in range(attempts):
+        result = ask_ollama(client, prompt)
+        if not result.startswith("Error:"):
+            return result
+        if attempt + 1 < attempts:
+            time.sleep(2 ** attempt)
+    raise SummaryError(result)
+
+def summarize_section(client, section):
+    """Summarize one section of a longer document"""
+    prompt = f"""
+        Summarize this part of a longer document concisely, keeping the key facts:\n\n{section}
+    """
+    return ask_ollama_or_raise(client, prompt)
+
+def map_reduce_summarize(client, text, max_tokens=SECTION_TOKENS, workers=MAX_WORKERS):
+    """Summarize sections concurrently, then reduce the partial summaries (recursively if needed).
+
+    Raises SummaryError if a section still fails after retries, rather than
+    summarizing the error message as if it were content.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while estimate_tokens(text) > max_tokens:
+            sections = split_into_sections(text, max_tokens)
+            print(f"🧩 Summarizing {len(sections)} sections ...")
+            partials = list(executor.map(lambda section: summarize_section(client, section), sections))
+            reduced = "\n\n".join(partials)
+            if len(sections) == 1 or len(reduced) >= len(text):
+                # The summaries are not getting shorter; reduce what we have.
+                text = reduced
+                break
+            text = reduced
+    prompt = f"""
+        Combine these partial summaries into one paragraph (Persian Language):\n\n{text}
+    """
+    return ask_ollama_or_raise(client, prompt)
+
+def summarize_text(client, text, max_tokens=SECTION_TOKENS, workers=MAX_WORKERS):
+    """Send text to the model for summarization
+
+    Long texts are split into sections that are summarized concurrently and
+    then combined, so any length fits the model's context window. Raises
+    SummaryError if the model cannot be reached.
+    """
+    if estimate_tokens(text) > max_tokens:
+        return map_reduce_summarize(client, text, max_tokens, workers)
 
-def summarize_text(client, text):
-    """Send text to the model for summarization"""
     prompt = f"""
         Summarize this text in one paragraph (Persian Language):\n\n{text}
     """
-    result = ask_ollama(client, prompt)
-    return result
+    return ask_ollama_or_raise(client, prompt)
 
 def save_summary_to_word(summary, output_path="summary.docx"):
     """Save summary to Word file"""
@@ -60,7 +154,11 @@ if __name__ == "__main__":
 
     print("🧠 Generating summary with Ollama ...")
     client = create_client(OLLAMA_API_KEY)
-    summary = summarize_text(client, text)
+    try:
+        summary = summarize_text(client, text)
+    except SummaryError as e:
+        print(f"❌ Summarization failed: {e}")
+        raise SystemExit(1)
 
     print("💾 Saving to Word file ...")
     save_summary_to_word(summary)
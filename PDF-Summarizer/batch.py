@@ -0,0 +1,136 @@
+# Batch mode: summarize every PDF in a folder into one .docx per file.
+#
+#   python batch.py input_folder output_folder --workers 8
+#
+# Progress is recorded in output_folder/journal.jsonl, so an interrupted run
+# can simply be started again and only unfinished files are processed.
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app import OLLAMA_API_KEY, create_client, extract_text_from_pdf, save_summary_to_word, summarize_text
+
+JOURNAL_NAME = "journal.jsonl"
+
+
+def find_pdfs(input_dir):
+    """All PDF files under input_dir, as paths relative to it"""
+    found = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                found.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return sorted(found)
+
+
+def file_signature(path):
+    """Size and modification time; a changed file is summarized again"""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_journal(journal_path):
+    """Return {relative path: last journal record} (later lines win)"""
+    records = {}
+    if os.path.exists(journal_path):
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partially written last line of an interrupted run
+                records[record["file"]] = record
+    return records
+
+
+class Journal:
+    """Append-only, thread-safe progress journal"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def write(self, record):
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def summarize_directory(input_dir, output_dir, workers=4, extract_workers=None, section_workers=2):
+    """Summarize all PDFs in input_dir, skipping files finished by an earlier run"""
+    os.makedirs(output_dir, exist_ok=True)
+    journal_path = os.path.join(output_dir, JOURNAL_NAME)
+    done = load_journal(journal_path)
+    journal = Journal(journal_path)
+
+    pending = []
+    skipped = 0
+    for rel_path in find_pdfs(input_dir):
+        signature = file_signature(os.path.join(input_dir, rel_path))
+        record = done.get(rel_path)
+        if record and record["status"] == "done" and record["signature"] == signature \
+                and os.path.exists(record["output"]):
+            skipped += 1
+            continue
+        pending.append((rel_path, signature))
+
+    print(f"📂 {len(pending)} PDFs to summarize ({skipped} already done)")
+    client = create_client(OLLAMA_API_KEY)
+    results = []
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as extractors:
+        def process(item):
+            rel_path, signature = item
+            output_path = os.path.join(output_dir, os.path.splitext(rel_path)[0] + ".docx")
+            record = {"file": rel_path, "signature": signature, "output": output_path}
+            start = time.perf_counter()
+            try:
+                text = extractors.submit(extract_text_from_pdf, os.path.join(input_dir, rel_path)).result()
+                extracted = time.perf_counter()
+                summary = summarize_text(client, text, workers=section_workers)
+                os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                save_summary_to_word(summary, output_path)
+                record.update(status="done", extract_seconds=round(extracted - start, 3))
+            except Exception as e:
+                record.update(status="failed", error=str(e))
+            record["seconds"] = round(time.perf_counter() - start, 3)
+            journal.write(record)
+            print(f"{'✅' if record['status'] == 'done' else '❌'} {rel_path} ({record['seconds']}s)")
+            return record
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process, pending))
+        elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if r["status"] == "done"]
+    report = {
+        "files": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "skipped": skipped,
+        "seconds": round(elapsed, 3),
+        "files_per_minute": round(len(succeeded) / elapsed * 60, 2) if elapsed else 0.0,
+        "avg_seconds_per_file": round(sum(r["seconds"] for r in results) / len(results), 3) if results else 0.0,
+    }
+    print("\n📊 Batch report")
+    for key, value in report.items():
+        print(f"   {key}: {value}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a folder of PDFs")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--workers", type=int, default=4, help="files summarized concurrently")
+    parser.add_argument("--extract-workers", type=int, default=None, help="PDF extraction processes")
+    parser.add_argument("--section-workers", type=int, default=2, help="concurrent sections per long file")
+    args = parser.parse_args()
+
+    summarize_directory(args.input_dir, args.output_dir, args.workers, args.extract_workers, args.section_workers)
@@ -1,7 +1,10 @@
-from ollama import Client
+from ollama import AsyncClient, Client
 from dotenv import load_dotenv
 from ddgs import DDGS
+from enrich import TOP_N, enrich_results, format_results
+import asyncio
 import os
+import time
 
 # Load Environment Variables
 load_dotenv()
@@ -10,6 +13,12 @@ API_KEY = os.getenv("OLLAMA_API_KEY", "")
 Summarizer_MODEL = os.getenv("OLLAMA_GPT_MODEL", "")
 Translator_MODEL = os.getenv("OLLAMA_DEEPSEEK_MODEL", "")
 
+SUMMARIZER_PROMPT = "You are a helpful summarizer. Return the results as a single, continuous piece of prose; do not use tables."
+TRANSLATOR_PROMPT = "You are a professional translator who translates English to fluent Persian. Use natural, clear Farsi with proper punctuation."
+
+# Paragraphs translated at the same time while the summary is still streaming
+TRANSLATE_CONCURRENCY = 3
+
 # Ollama Client
 client = Client(
     host="https://ollama.com",
@@ -18,16 +27,31 @@ client = Client(
     }
 )
 
+# Async client for the pipelined flow
+async_client = AsyncClient(
+    host="https://ollama.com",
+    headers={
+        "Authorization": f"Bearer {API_KEY}"
+    }
+)
+
 # Agent 1: Search
-def search_agent(topic: str, num_results: int = 3) -> str:
+def search_results(topic: str, num_results: int = 3) -> list:
     print(f"🔍 Searching for: {topic}")
-    results = []
 
     with DDGS() as ddgs:
-        for r in ddgs.text(topic, max_results=num_results):
-            results.append(f"Title: {r['title']}\nURL: {r['href']}\nSnippet: {r['body']}\n")
+        return list(ddgs.text(topic, max_results=num_results))
 
-    return "\n\n".join(results)
+
+def search_agent(topic: str, num_results: int = 3) -> str:
+    return format_results(search_results(topic, num_results))
+
+
+# Agent 1b: Enrich the top results with their full page text
+async def enriched_search_agent(topic: str, num_results: int = 3, top_n: int = TOP_N) -> str:
+    results = await asyncio.to_thread(search_results, topic, num_results)
+    print(f"📄 Fetching the top {min(top_n, len(results))} pages...")
+    return format_results(await enrich_results(results, top_n))
 
 # Agent 2: Summarizer
 def summarize_agent(text:str) -> str:
@@ -38,7 +62,7 @@ def summarize_agent(text:str) -> str:
         messages=[
             {
                 "role":"system", 
-                "content" : "You are a helpful summarizer. Return the results as a single, continuous piece of prose; do not use tables."
+                "content" : SUMMARIZER_PROMPT
             },
             {
                 "role":"user", 
@@ -58,7 +82,7 @@ def translator_agent(english_text: str) -> str:
         messages=[
             {
                 "role": "system", 
-                "content" : "You are a professional translator who translates English to fluent Persian. Use natural, clear Farsi with proper punctuation."
+                "content" : TRANSLATOR_PROMPT
             },
             {
                 "role":"user", 
@@ -78,10 +102,122 @@ def writer_agent(text: str, filename:str):
 
     print("✅ File saved successfully!")
 
+# Pipelined agents: the summary is streamed and cut into paragraphs, each
+# paragraph is translated as soon as it is complete, and translations are
+# appended to the file in order while the rest is still being produced.
+
+SUMMARIZER_STREAM_PROMPT = (
+    "You are a helpful summarizer. Return the results as continuous prose in short paragraphs "
+    "separated by blank lines; do not use tables or headings."
+)
+
+
+async def summarize_agent_stream(text: str, paragraphs: asyncio.Queue):
+    """Stream the summary and put each completed paragraph on the queue (None when done)"""
+    print("🧩 Summarizing search results (streaming)...")
+    buffer = ""
+    try:
+        stream = await async_client.chat(
+            model=Summarizer_MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARIZER_STREAM_PROMPT},
+                {"role": "user", "content": f"Summarize the following search results:\n\n{text}"},
+            ],
+            stream=True,
+        )
+        async for part in stream:
+            buffer += part.message.content or ""
+            while "\n\n" in buffer:
+                paragraph, buffer = buffer.split("\n\n", 1)
+                if paragraph.strip():
+                    await paragraphs.put(paragraph.strip())
+        if buffer.strip():
+            await paragraphs.put(buffer.strip())
+    finally:
+        await paragraphs.put(None)
+
+
+async def translate_paragraph(paragraph: str, limit: asyncio.Semaphore) -> str:
+    async with limit:
+        response = await async_client.chat(
+            model=Translator_MODEL,
+            messages=[
+                {"role": "system", "content": TRANSLATOR_PROMPT},
+                {"role": "user", "content": f"Translate this text to Persian:\n\n{paragraph}"},
+            ],
+        )
+        return response.message.content.strip()
+
+
+async def translator_stage(paragraphs: asyncio.Queue, translations: asyncio.Queue, concurrency: int):
+    """Start a translation task per paragraph; pass the tasks on in paragraph order (None when done)"""
+    print("🌐 Translating paragraphs into Persian as they arrive...")
+    limit = asyncio.Semaphore(concurrency)
+    while (paragraph := await paragraphs.get()) is not None:
+        await translations.put(asyncio.create_task(translate_paragraph(paragraph, limit)))
+    await translations.put(None)
+
+
+async def writer_stage(translations: asyncio.Queue, filename: str) -> int:
+    """Append translated paragraphs to the file in order; return the paragraph count"""
+    print(f"💾 Writing Persian summary to {filename}")
+    count = 0
+    with open(filename, "w", encoding="utf-8") as f:
+        while (task := await translations.get()) is not None:
+            text = await task
+            f.write(("\n\n" if count else "") + text)
+            f.flush()
+            count += 1
+            print(f"   ✍️ Paragraph {count} written")
+    print("✅ File saved successfully!")
+    return count
+
+
+async def research_pipeline(topic: str, filename: str = "result.txt", num_results: int = 3,
+                            concurrency: int = TRANSLATE_CONCURRENCY, enrich: bool = True) -> dict:
+    """Search (and enrich), then summarize, translate and write concurrently; return timings"""
+    start = time.perf_counter()
+    if enrich:
+        search_text = await enriched_search_agent(topic, num_results)
+    else:
+        search_text = await asyncio.to_thread(search_agent, topic, num_results)
+    searched = time.perf_counter()
+
+    paragraphs, translations = asyncio.Queue(), asyncio.Queue()
+    tasks = [
+        asyncio.create_task(summarize_agent_stream(search_text, paragraphs)),
+        asyncio.create_task(translator_stage(paragraphs, translations, concurrency)),
+        asyncio.create_task(writer_stage(translations, filename)),
+    ]
+    try:
+        *_, count = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finished = time.perf_counter()
+    return {
+        "paragraphs": count,
+        "search_seconds": round(searched - start, 2),
+        "pipeline_seconds": round(finished - searched, 2),
+        "total_seconds": round(finished - start, 2),
+    }
+
+
 # Orchestrator
 def main():
     topic = input("Enter a topic to research: ")
 
+    # Agents 1-4, with summarizing, translating and writing overlapped
+    timings = asyncio.run(research_pipeline(topic, "result.txt"))
+
+    print(f"\n🎉 Done! Persian summary saved to result.txt ({timings['total_seconds']}s)")
+
+
+def main_sequential():
+    """The original one-stage-at-a-time flow, kept for comparison"""
+    topic = input("Enter a topic to research: ")
+
     # Agent 1
     search_results = search_agent(topic)
 
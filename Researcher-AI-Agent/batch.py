@@ -0,0 +1,208 @@
+# Research many topics in one run.
+#
+#   python batch.py topics.txt --output results
+#
+# Topics are read one per line. DuckDuckGo searches, summarizer calls and
+# translator calls each have their own concurrency limit and rate limit, and
+# search results are cached on disk. Each topic gets its own result file and
+# a throughput/latency report is written to <output>/report.json.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import statistics
+import time
+
+from agent import (
+    SUMMARIZER_PROMPT, TRANSLATOR_PROMPT, Summarizer_MODEL, Translator_MODEL,
+    async_client, search_agent,
+)
+from search_cache import SearchCache
+
+
+class AsyncRateLimiter:
+    """Allows at most `rate` calls per `per` seconds, spaced evenly"""
+
+    def __init__(self, rate: int, per: float = 60.0):
+        self.interval = per / rate
+        self.lock = asyncio.Lock()
+        self.next_time = time.monotonic()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Service:
+    """Concurrency limit plus optional rate limit for one backend"""
+
+    def __init__(self, name: str, concurrency: int, per_minute: int = None):
+        self.name = name
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limiter = AsyncRateLimiter(per_minute) if per_minute else None
+        self.calls = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, func, *args):
+        async with self.semaphore:
+            if self.limiter:
+                await self.limiter.wait()
+            start = time.perf_counter()
+            try:
+                result = func(*args)
+                return await result if asyncio.iscoroutine(result) else result
+            finally:
+                self.calls += 1
+                self.busy_seconds += time.perf_counter() - start
+
+
+def read_topics(path):
+    with open(path, "r", encoding="utf-8") as f:
+        topics = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return list(dict.fromkeys(topics))
+
+
+def topic_filename(topic):
+    # The slug is lossy ("C++" and "C"), so a short hash keeps topics apart.
+    slug = re.sub(r"[^\w]+", "_", topic.lower(), flags=re.UNICODE).strip("_")[:80]
+    digest = hashlib.blake2b(topic.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{slug or 'topic'}_{digest}.txt"
+
+
+async def summarize_async(text: str) -> str:
+    response = await async_client.chat(
+        model=Summarizer_MODEL,
+        messages=[
+            {"role": "system", "content": SUMMARIZER_PROMPT},
+            {"role": "user", "content": f"Summarize the following search results:\n\n{text}"},
+        ],
+    )
+    return response.message.content
+
+
+async def translate_async(text: str) -> str:
+    response = await async_client.chat(
+        model=Translator_MODEL,
+        messages=[
+            {"role": "system", "content": TRANSLATOR_PROMPT},
+            {"role": "user", "content": f"Translate this text to Persian:\n\n{text}"},
+        ],
+    )
+    return response.message.content
+
+
+async def research_topic(topic, output_dir, services, cache, num_results):
+    """Search, summarize, translate and write one topic; return its report entry"""
+    start = time.perf_counter()
+    entry = {"topic": topic, "file": os.path.join(output_dir, topic_filename(topic))}
+    try:
+        # Only real DuckDuckGo searches go through the search limits; cache hits skip them.
+        search_results = await asyncio.to_thread(cache.get, topic, num_results)
+        if search_results is None:
+            search_results = await services["search"].run(asyncio.to_thread, search_agent, topic, num_results)
+            if search_results:
+                await asyncio.to_thread(cache.put, topic, num_results, search_results)
+        if not search_results:
+            raise ValueError("no search results")
+        summary = await services["summarizer"].run(summarize_async, search_results)
+        translated = await services["translator"].run(translate_async, summary)
+        with open(entry["file"], "w", encoding="utf-8") as f:
+            f.write(translated)
+        entry["status"] = "ok"
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = str(e)
+    entry["seconds"] = round(time.perf_counter() - start, 2)
+    print(f"{'✅' if entry['status'] == 'ok' else '❌'} {topic} ({entry['seconds']}s)")
+    return entry
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 2)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[q - 1], 2)
+
+
+async def research_batch(topics, output_dir="results", num_results=3,
+                         search_concurrency=4, llm_concurrency=8,
+                         search_per_minute=30, summarizer_per_minute=60, translator_per_minute=60,
+                         cache=None, skip_existing=True):
+    """Research all topics concurrently and return the report"""
+    os.makedirs(output_dir, exist_ok=True)
+    cache = cache or SearchCache()
+    purged = await asyncio.to_thread(cache.purge)
+    if purged:
+        print(f"🧹 Removed {purged} expired search(es) from the cache")
+    services = {
+        "search": Service("search", search_concurrency, search_per_minute),
+        "summarizer": Service("summarizer", llm_concurrency, summarizer_per_minute),
+        "translator": Service("translator", llm_concurrency, translator_per_minute),
+    }
+
+    pending = [t for t in topics if not (skip_existing and os.path.exists(os.path.join(output_dir, topic_filename(t))))]
+    skipped = len(topics) - len(pending)
+    if skipped:
+        print(f"⏭️ Skipping {skipped} topic(s) with existing results")
+    print(f"🚀 Researching {len(pending)} topic(s)")
+
+    start = time.perf_counter()
+    entries = await asyncio.gather(*(research_topic(t, output_dir, services, cache, num_results) for t in pending))
+    elapsed = time.perf_counter() - start
+
+    latencies = [e["seconds"] for e in entries if e["status"] == "ok"]
+    report = {
+        "topics": len(topics),
+        "skipped": skipped,
+        "succeeded": len(latencies),
+        "failed": len(entries) - len(latencies),
+        "elapsed_seconds": round(elapsed, 2),
+        "topics_per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed else None,
+        "latency_seconds": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": round(max(latencies), 2) if latencies else None,
+        },
+        "search_cache": {"hits": cache.hits, "misses": cache.misses},
+        "services": {
+            name: {"calls": s.calls, "busy_seconds": round(s.busy_seconds, 2)} for name, s in services.items()
+        },
+        "results": entries,
+    }
+    with open(os.path.join(output_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Research many topics from a file")
+    parser.add_argument("topics_file", help="text file with one topic per line")
+    parser.add_argument("--output", default="results", help="directory for result files")
+    parser.add_argument("--num-results", type=int, default=3)
+    parser.add_argument("--search-concurrency", type=int, default=4)
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--search-rpm", type=int, default=30, help="DuckDuckGo searches per minute")
+    parser.add_argument("--summarizer-rpm", type=int, default=60)
+    parser.add_argument("--translator-rpm", type=int, default=60)
+    parser.add_argument("--cache-ttl", type=float, default=24, help="search cache TTL in hours")
+    parser.add_argument("--force", action="store_true", help="redo topics that already have a result file")
+    args = parser.parse_args()
+
+    report = asyncio.run(research_batch(
+        read_topics(args.topics_file), args.output, args.num_results,
+        args.search_concurrency, args.llm_concurrency,
+        args.search_rpm, args.summarizer_rpm, args.translator_rpm,
+        SearchCache(ttl=args.cache_ttl * 3600), not args.force,
+    ))
+    print(f"\n📊 {report['succeeded']}/{report['topics'] - report['skipped']} topics in {report['elapsed_seconds']}s "
+          f"({report['topics_per_minute']} per minute), p50 {report['latency_seconds']['p50']}s, "
+          f"p95 {report['latency_seconds']['p95']}s")
+    print(f"   Search cache: {report['search_cache']['hits']} hits, {report['search_cache']['misses']} misses")
@@ -0,0 +1,189 @@
+# Full-page enrichment of search results.
+#
+# The top result pages are fetched concurrently through one pooled httpx
+# client, with a cap on simultaneous connections per host. Each page is
+# reduced to its main text (scripts, navigation, headers, footers and short
+# menu-like lines are dropped), cut to a token budget, and pages that are
+# near-duplicates of an earlier one are skipped before the text reaches the
+# summarizer.
+
+import asyncio
+import re
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import httpx
+
+TOP_N = 3
+PAGE_TOKENS = 800
+PER_HOST = 2
+MAX_CONNECTIONS = 10
+FETCH_TIMEOUT = 10
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+DEDUP_THRESHOLD = 0.8
+MIN_LINE_WORDS = 6
+
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "button", "select"}
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "table", "blockquote", "pre",
+              "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt", "figcaption"}
+BOILERPLATE_HINTS = re.compile(r"cookie|subscribe|sign (in|up)|log ?in|newsletter|all rights reserved|privacy policy", re.I)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def main_text(html: str) -> str:
+    """Readable body text of an HTML page with boilerplate removed"""
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # Malformed markup: keep whatever was parsed so far.
+        pass
+    lines = []
+    for line in "".join(parser.parts).splitlines():
+        line = " ".join(unescape(line).split())
+        # Menus, breadcrumbs and button labels are short; cookie banners and the like have telltale words.
+        if len(line.split()) >= MIN_LINE_WORDS and not BOILERPLATE_HINTS.search(line):
+            lines.append(line)
+    return "\n".join(dict.fromkeys(lines))
+
+
+def truncate_to_tokens(text: str, max_tokens: int = PAGE_TOKENS) -> str:
+    """Cut text to about max_tokens (4 characters per token), preferably at a sentence end"""
+    limit = max_tokens * 4
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    end = max(cut.rfind(". "), cut.rfind(".\n"), cut.rfind("\n"))
+    return cut[:end + 1] if end > limit // 2 else cut
+
+
+def _shingles(text: str, n: int = 3):
+    words = text.lower().split()
+    return {tuple(words[i:i + n]) for i in range(max(len(words) - n + 1, 1))}
+
+
+def _contained(a: set, b: set):
+    """Share of a's shingles that also appear in b"""
+    return len(a & b) / len(a) if a else 0.0
+
+
+def drop_near_duplicates(pages, threshold: float = DEDUP_THRESHOLD):
+    """Drop pages whose "content" is mostly contained in an earlier page; pages without content are kept"""
+    kept, seen = [], []
+    for page in pages:
+        if not page.get("content"):
+            kept.append(page)
+            continue
+        shingles = _shingles(page["content"])
+        if any(_contained(shingles, other) >= threshold for other in seen):
+            continue
+        kept.append(page)
+        seen.append(shingles)
+    return kept
+
+
+class PageFetcher:
+    """Pooled async HTTP client with a per-host connection limit"""
+
+    def __init__(self, per_host: int = PER_HOST, max_connections: int = MAX_CONNECTIONS, timeout: float = FETCH_TIMEOUT):
+        self.per_host = per_host
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; ResearcherAgent/1.0)"},
+        )
+        self._hosts = {}
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def fetch(self, url: str):
+        """Page HTML, or None for errors and non-HTML responses; at most MAX_PAGE_BYTES are read"""
+        async with self._host_limit(url):
+            try:
+                async with self.client.stream("GET", url) as response:
+                    if response.status_code != 200 or "html" not in response.headers.get("content-type", "html"):
+                        return None
+                    body = bytearray()
+                    async for block in response.aiter_bytes():
+                        body += block
+                        if len(body) >= MAX_PAGE_BYTES:
+                            break
+                    return body.decode(response.encoding or "utf-8", errors="replace")
+            except (httpx.HTTPError, httpx.InvalidURL):
+                # A malformed href raises InvalidURL, which is not an HTTPError.
+                return None
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def enrich_results(results, top_n: int = TOP_N, page_tokens: int = PAGE_TOKENS, fetcher: PageFetcher = None):
+    """Add a "content" field with the cleaned page text to the top_n results.
+
+    results are DDGS dicts (title, href, body). Pages that fail to load or
+    have no usable text keep only their snippet; near-duplicate pages are
+    dropped. The order is kept and results past top_n are returned unchanged.
+    """
+    own_fetcher = fetcher is None
+    fetcher = fetcher or PageFetcher()
+    try:
+        top = results[:top_n]
+        pages = await asyncio.gather(*(fetcher.fetch(r["href"]) for r in top))
+    finally:
+        if own_fetcher:
+            await fetcher.aclose()
+
+    # Parsing up to MAX_PAGE_BYTES of HTML is CPU work; keep it off the event loop.
+    texts = await asyncio.gather(*(asyncio.to_thread(main_text, html) for html in pages if html))
+    texts = iter(texts)
+    enriched = []
+    for result, html in zip(top, pages):
+        text = truncate_to_tokens(next(texts), page_tokens) if html else ""
+        enriched.append({**result, "content": text} if text else result)
+    return drop_near_duplicates(enriched) + list(results[top_n:])
+
+
+def format_results(results) -> str:
+    """Search results as text for the summarizer, including page content when present"""
+    blocks = []
+    for r in results:
+        block = f"Title: {r['title']}\nURL: {r['href']}\nSnippet: {r['body']}\n"
+        if r.get("content"):
+            block += f"Content:\n{r['content']}\n"
+        blocks.append(block)
+    return "\n\n".join(blocks)
@@ -0,0 +1,58 @@
+# On-disk cache of search_agent results.
+#
+# Results are stored in a small SQLite database keyed by the normalized topic
+# and the number of results, and are reused until they are older than the
+# TTL, so re-running a batch does not repeat DuckDuckGo searches.
+
+import os
+import sqlite3
+import threading
+import time
+
+SEARCH_CACHE_PATH = "search_cache.sqlite"
+SEARCH_CACHE_TTL = 24 * 3600
+
+
+def normalize_topic(topic):
+    return " ".join(topic.split()).lower()
+
+
+class SearchCache:
+    def __init__(self, path=SEARCH_CACHE_PATH, ttl=SEARCH_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS searches (
+                topic TEXT, num_results INTEGER, results TEXT, created REAL,
+                PRIMARY KEY (topic, num_results));
+        """)
+
+    def get(self, topic, num_results):
+        """Cached results younger than the TTL, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT results, created FROM searches WHERE topic = ? AND num_results = ?",
+                (normalize_topic(topic), num_results),
+            ).fetchone()
+            if row and time.time() - row[1] < self.ttl:
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, topic, num_results, results):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (topic, num_results, results, created) VALUES (?, ?, ?, ?)",
+                (normalize_topic(topic), num_results, results, time.time()),
+            )
+
+    def purge(self):
+        """Delete expired entries; return how many were removed"""
+        with self.lock, self.conn:
+            return self.conn.execute("DELETE FROM searches WHERE created < ?", (time.time() - self.ttl,)).rowcount
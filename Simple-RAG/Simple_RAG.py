@@ -1,12 +1,109 @@
-!pip install -qU chromadb
-!pip install -qU openai
-!pip install -qU pypdf2
-!pip install -qU python-docx
-!pip install -qU sentence-transformers
+# Required libraries installation:
+# pip install chromadb openai pypdf2 python-docx sentence-transformers
+#
+# Importable module: the embedding model, the Chroma client and the LLM client
+# are created lazily on first use. Run this file for the YOLOv7 demo, or
+# server.py to keep everything warm in a long-running process.
 
-import docx
-import PyPDF2
 import os
+import threading
+
+import docx
+
+from batch import batch_rag_answer
+from chunker import chunk_spans, materialize, tokenizer_counter
+from context_packer import pack_context
+from indexer import CHROMA_PATH, incremental_index, remove_files
+from ingestion import extract_pdf_pages, ingest_document
+from page_cache import cached_pages
+from streaming import stream_completion, print_stream_metrics
+
+COLLECTION_NAME = "documents_collection"
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+OPEN_ROUTER_API_KEY = os.getenv("OPEN_ROUTER_API_KEY", "***")
+OPEN_ROUTER_MODEL_NAME = os.getenv("OPEN_ROUTER_MODEL_NAME", "openai/gpt-oss-120b:free")
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant for retrieval-augmented generation (RAG).\n"
+    "Answer ONLY using the provided context. "
+    "If the answer is not found in the context, say: "
+    "'I don't know based on the provided documents.'"
+)
+
+_lock = threading.RLock()
+_embedding_function = None
+_chroma_client = None
+_collection = None
+_llm_client = None
+_query_cache = None
+
+
+def get_embedding_function():
+    """SentenceTransformer embedding function, loaded on first use"""
+    global _embedding_function
+    with _lock:
+        if _embedding_function is None:
+            from chromadb.utils import embedding_functions
+            _embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=EMBEDDING_MODEL_NAME
+            )
+        return _embedding_function
+
+
+def get_token_counter():
+    """Exact token counter from the embedding model's tokenizer (loads the model)"""
+    model = getattr(get_embedding_function(), "_model", None)
+    tokenizer = getattr(model, "tokenizer", None)
+    # Without a tokenizer the chunker falls back to its approximate count with a safety margin.
+    return tokenizer_counter(tokenizer) if tokenizer is not None else None
+
+
+def get_chroma_client():
+    """Persistent Chroma client, opened on first use"""
+    global _chroma_client
+    with _lock:
+        if _chroma_client is None:
+            import chromadb
+            _chroma_client = chromadb.PersistentClient(path=CHROMA_PATH)
+        return _chroma_client
+
+
+def get_collection():
+    """The documents collection, created on first use"""
+    global _collection
+    with _lock:
+        if _collection is None:
+            _collection = get_chroma_client().get_or_create_collection(
+                name=COLLECTION_NAME,
+                embedding_function=get_embedding_function()
+            )
+        return _collection
+
+
+def get_llm_client():
+    """OpenRouter (OpenAI-compatible) client, created on first use"""
+    global _llm_client
+    with _lock:
+        if _llm_client is None:
+            from openai import OpenAI
+            _llm_client = OpenAI(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=OPEN_ROUTER_API_KEY,
+            )
+        return _llm_client
+
+
+def get_query_cache():
+    """Shared query cache for the documents collection"""
+    global _query_cache
+    with _lock:
+        if _query_cache is None:
+            from query_cache import QueryCache
+            _query_cache = QueryCache(get_embedding_function(), get_collection(),
+                                      max_size=256, ttl=3600, similarity=0.95)
+        return _query_cache
+
 
 def read_text_file(file_path: str):
     """Read content from a text file"""
@@ -14,13 +111,8 @@ def read_text_file(file_path: str):
         return file.read()
 
 def read_pdf_file(file_path: str):
-    """Read Content From a PDF File"""
-    text=""
-    with open(file_path, "rb") as file:
-        pdf_reader=PyPDF2.PdfReader(file)
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-    return text
+    """Read Content From a PDF File (pages come from the page cache when the file was read before)"""
+    return "".join(page + "\n" for page in cached_pages(file_path, extract_pdf_pages))
 
 
 def read_docx_file(file_path: str):
@@ -41,15 +133,6 @@ def read_document(file_path: str):
     else:
         raise ValueError(f"Unsupported File Format: {file_extension}")
 
-!gdown "https://drive.google.com/uc?id=1v4_2O15UPjaUEZO-7oijqSWFDnQiEG6t&confirm=t"
-
-file_path = "/content/yolov7_paper.pdf"
-
-text = read_document(file_path)
-
-print("\n======Extracted PDF Content=======\n")
-print(text[:500])
-
 def split_text(text: str, chunk_size: int = 500, chunk_overlap: int = 100):
     """Split text into overlapping chunks (very simple version)."""
     text = text.replace("\n", " ").strip()
@@ -66,31 +149,6 @@ def split_text(text: str, chunk_size: int = 500, chunk_overlap: int = 100):
 
     return chunks
 
-sample = "This is a very long paragraph of text that you want to split into smaller chunks for embedding or storage."
-chunks = split_text(sample, chunk_size=10, chunk_overlap=2)
-print(chunks)
-
-chunks = split_text(text, chunk_size=500, chunk_overlap=50)
-
-print("Chunk-01", chunks[0])
-print("Chunk-02", chunks[1])
-print("Number of Chunks", len(chunks))
-
-import chromadb
-
-from chromadb.utils import embedding_functions
-
-client = chromadb.PersistentClient(path="chroma_db")
-
-sentence_transformer_ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-    model_name="all-MiniLM-L6-v2"
-)
-
-collection = client.get_or_create_collection(
-    name="documents_collection",
-    embedding_function=sentence_transformer_ef
-)
-
 def process_document(file_path: str):
     """Process a single document and prepare it for ChromaDB"""
     try:
@@ -107,16 +165,6 @@ def process_document(file_path: str):
         print(f"Error processing {file_path}: {str(e)}")
         return [], [], []
 
-ids, chunks, metadatas = process_document(file_path)
-
-print("id[0] -> ", ids[0])
-print("metadatas[0] -> ", metadatas[0])
-print("chunks[0] -> ", chunks[0])
-
-len(chunks)
-
-collection.add(documents=chunks, metadatas=metadatas, ids=ids)
-
 def semantic_search(collection, query: str, n_results: int = 2):
     """Perform a minimal semantic search."""
     return collection.query(
@@ -125,8 +173,15 @@ def semantic_search(collection, query: str, n_results: int = 2):
         include=["documents", "metadatas"]
     )
 
-def get_context_with_sources(results):
-    """This takes the search results from the previous function and makes them easy to use, a clean paragraph of text (context), a list of where it came from (sources)"""
+def get_context_with_sources(results, max_tokens: int = None):
+    """This takes the search results from the previous function and makes them easy to use, a clean paragraph of text (context), a list of where it came from (sources)
+
+    With max_tokens set, adjacent chunks are merged without their overlap,
+    near-duplicates are dropped and the context is packed up to that budget.
+    """
+    if max_tokens is not None:
+        return pack_context(results, max_tokens=max_tokens)
+
     if not results or not results.get("documents") or not results["documents"][0]:
         return "", []
 
@@ -161,26 +216,6 @@ def ask(collection, query: str, n_results: int = 2):
 
     return context, sources
 
-query = "What is YOLOv7"
-context, sources = ask(collection, query, n_results=5)
-
-OPEN_ROUTER_API_KEY = "***"
-OPEN_ROUTER_MODEL_NAME = "openai/gpt-oss-120b:free"
-
-from openai import OpenAI
-
-client = OpenAI(
-  base_url = "https://openrouter.ai/api/v1",
-  api_key = OPEN_ROUTER_API_KEY,
-)
-
-SYSTEM_PROMPT = (
-    "You are a helpful assistant for retrieval-augmented generation (RAG).\n"
-    "Answer ONLY using the provided context. "
-    "If the answer is not found in the context, say: "
-    "'I don't know based on the provided documents.'"
-)
-
 def build_messages(context: str, question: str):
     """Create messages for OpenAI API."""
     return [
@@ -188,28 +223,62 @@ def build_messages(context: str, question: str):
         {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}\nAnswer:"}
     ]
 
-def rag_answer(collection, query: str, n_results: int = 4, model: str = OPEN_ROUTER_MODEL_NAME):
-    """Run semantic search + OpenAI generation, and print results."""
+def generate_answer(collection, query: str, n_results: int = 4, model: str = OPEN_ROUTER_MODEL_NAME,
+                    context_tokens: int = None):
+    """Run semantic search + OpenAI generation and return (answer, sources) without printing."""
     results = semantic_search(collection, query, n_results)
-    context, sources = get_context_with_sources(results)
+    context, sources = get_context_with_sources(results, max_tokens=context_tokens)
 
     if not context.strip():
-        print("⚠️ No relevant context found.")
         return "", []
 
-    messages = build_messages(context, query)
-
-    response = client.chat.completions.create(
+    response = get_llm_client().chat.completions.create(
         model=model,
-        messages=messages,
+        messages=build_messages(context, query),
         temperature=0.2,
         max_tokens=512
     )
 
-    answer = response.choices[0].message.content.strip()
+    return (response.choices[0].message.content or "").strip(), sources
+
+def rag_answer(collection, query: str, n_results: int = 4, model: str = OPEN_ROUTER_MODEL_NAME, stream: bool = False,
+               context_tokens: int = None):
+    """Run semantic search + OpenAI generation, and print results.
+
+    With stream=True the answer is printed token by token as it arrives and
+    time-to-first-token and tokens/sec are reported. context_tokens limits
+    the packed context to that many tokens.
+    """
+    results = semantic_search(collection, query, n_results)
+    context, sources = get_context_with_sources(results, max_tokens=context_tokens)
+
+    if not context.strip():
+        print("⚠️ No relevant context found.")
+        return "", []
 
-    print("\n=== ANSWER ===\n")
-    print(answer or "[No answer generated]")
+    messages = build_messages(context, query)
+
+    if stream:
+        print("\n=== ANSWER ===\n")
+        metrics = {}
+        pieces = []
+        for piece in stream_completion(get_llm_client(), model, messages, metrics):
+            print(piece, end="", flush=True)
+            pieces.append(piece)
+        answer = "".join(pieces).strip()
+        print("" if answer else "[No answer generated]")
+    else:
+        response = get_llm_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=512
+        )
+
+        answer = response.choices[0].message.content.strip()
+
+        print("\n=== ANSWER ===\n")
+        print(answer or "[No answer generated]")
 
     print("\n=== SOURCES ===")
     if sources:
@@ -218,13 +287,122 @@ def rag_answer(collection, query: str, n_results: int = 4, model: str = OPEN_ROU
     else:
         print("[No sources found]")
 
+    if stream:
+        print_stream_metrics(metrics)
+
     return answer, sources
 
-query = "YOLOv7 outperforms which models"
-rag_answer(collection, query, n_results=2)
+def cached_rag_answer(collection, query: str, n_results: int = 4, model: str = OPEN_ROUTER_MODEL_NAME):
+    """rag_answer behind the query cache (exact and near-duplicate questions)."""
+    return get_query_cache().get_or_compute(
+        "answer", query, (n_results, model),
+        lambda embedding: rag_answer(collection, query, n_results, model)
+    )
+
+def main():
+    # Download the sample paper first:
+    # gdown "https://drive.google.com/uc?id=1v4_2O15UPjaUEZO-7oijqSWFDnQiEG6t&confirm=t"
+    file_path = "yolov7_paper.pdf"
+
+    text = read_document(file_path)
+
+    print("\n======Extracted PDF Content=======\n")
+    print(text[:500])
+
+    sample = "This is a very long paragraph of text that you want to split into smaller chunks for embedding or storage."
+    chunks = split_text(sample, chunk_size=10, chunk_overlap=2)
+    print(chunks)
 
-query = "Provide me an introduction to YOLOv7"
-rag_answer(collection, query, n_results=2)
+    chunks = split_text(text, chunk_size=500, chunk_overlap=50)
+
+    print("Chunk-01", chunks[0])
+    print("Chunk-02", chunks[1])
+    print("Number of Chunks", len(chunks))
+
+    # Sentence-aware chunking: chunk_spans yields (start, end) offsets into the
+    # original text, packed by sentence and paragraph up to the embedding model's
+    # 256-token window, counted with the model's own tokenizer. Strings are only
+    # created by materialize() at embed time; ingest_document and
+    # incremental_index below chunk the same way.
+    count_tokens = get_token_counter()
+    spans = list(chunk_spans(text, max_tokens=254, count_tokens=count_tokens))
+
+    print("Span-01", spans[0], next(materialize(text, spans[:1])))
+    print("Number of Spans", len(spans))
+
+    collection = get_collection()
+
+    # Alternative: a cached embedding function. Vectors are stored on disk by
+    # (model, chunk hash) and shared across runs and collections, and only chunks
+    # that were never seen before are encoded, in batches.
+    from embedding_cache import CachedEmbeddingFunction
+
+    cached_collection = get_chroma_client().get_or_create_collection(
+        name="documents_collection_cached",
+        embedding_function=CachedEmbeddingFunction(model_name=EMBEDDING_MODEL_NAME, batch_size=64)
+    )
+    # Streaming ingestion for large documents: pages are extracted (on a process
+    # pool for big PDFs) and chunks are added to the collection batch by batch,
+    # so the whole document is never held in memory at once. This collection
+    # is only filled this way; the main one below is kept up to date by the
+    # incremental indexer, and the two id schemes must not be mixed.
+    ingest_document(cached_collection, file_path, batch_size=64, count_tokens=count_tokens)
+
+    ids, chunks, metadatas = process_document(file_path)
+
+    print("id[0] -> ", ids[0])
+    print("metadatas[0] -> ", metadatas[0])
+    print("chunks[0] -> ", chunks[0])
+
+    # Incremental (re-)indexing, also streamed: only new or changed chunks are
+    # embedded. Other files already in the index are kept; prune=True only drops
+    # files that were deleted from disk (remove_files drops files explicitly).
+    # File and chunk hashes are kept in chroma_db/index_manifest.json.
+    stats = incremental_index(collection, [file_path], count_tokens=count_tokens, prune=True)
+    print(stats)
+
+    query = "What is YOLOv7"
+    context, sources = ask(collection, query, n_results=5)
+
+    query = "YOLOv7 outperforms which models"
+    rag_answer(collection, query, n_results=2)
+
+    query = "Provide me an introduction to YOLOv7"
+    rag_answer(collection, query, n_results=2)
+
+    query = "What are extended efficient layer aggregation networks"
+    rag_answer(collection, query, n_results=5)
+
+    query = "What are extended efficient layer aggregation networks"
+    rag_answer(collection, query, n_results=5, stream=True)
+
+    query = "What are extended efficient layer aggregation networks"
+    rag_answer(collection, query, n_results=8, context_tokens=800)
+
+    # Query cache: exact repeats and near-duplicate questions (cosine similarity
+    # of the query embeddings) are answered from memory until the collection
+    # changes or the entry expires.
+    from query_cache import cached_semantic_search
+
+    cached_rag_answer(collection, "What is YOLOv7?", n_results=2)
+    cached_rag_answer(collection, "what is yolov7", n_results=2)
+    cached_semantic_search(get_query_cache(), collection, "What is YOLOv7", n_results=5)
+    get_query_cache().report()
+
+    # Batch answering for evaluation sets: all questions are retrieved with one
+    # Chroma call, then completions run concurrently (bounded, rate limited).
+    questions = [
+        "What is YOLOv7",
+        "YOLOv7 outperforms which models",
+        "What are extended efficient layer aggregation networks",
+    ]
+    answers = batch_rag_answer(
+        collection, questions, get_llm_client(), OPEN_ROUTER_MODEL_NAME,
+        get_context_with_sources, build_messages,
+        n_results=4, max_concurrency=8, requests_per_minute=20
+    )
+    for question, (answer, sources) in zip(questions, answers):
+        print(f"\nQ: {question}\nA: {answer}\nSources: {', '.join(sources)}")
 
-query = "What are extended efficient layer aggregation networks"
-rag_answer(collection, query, n_results=5)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate` calls per `per` seconds"""
+
+    def __init__(self, rate: int, per: float = 60.0):
+        self.interval = per / rate
+        self.lock = threading.Lock()
+        self.next_time = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _retry_after(error):
+    """Seconds to wait for a 429 response, or None if error is not a rate limit"""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def batch_semantic_search(collection, queries, n_results: int = 2, query_batch_size: int = 512):
+    """Search many queries with one Chroma call per batch and return one result dict per query"""
+    per_query = []
+    for i in range(0, len(queries), query_batch_size):
+        results = collection.query(
+            query_texts=queries[i:i + query_batch_size],
+            n_results=n_results,
+            include=["documents", "metadatas"]
+        )
+        for documents, metadatas in zip(results["documents"], results["metadatas"]):
+            per_query.append({"documents": [documents], "metadatas": [metadatas]})
+    return per_query
+
+
+def complete_with_retry(client, model: str, messages, limiter: RateLimiter = None,
+                        max_retries: int = 5, temperature: float = 0.2, max_tokens: int = 512):
+    """One chat completion that waits for the rate limiter and backs off on 429 responses"""
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.wait()
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            return (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            retry_after = _retry_after(e)
+            if retry_after is None or attempt == max_retries:
+                raise
+            time.sleep(max(retry_after, 2 ** attempt) + random.uniform(0, 1))
+
+
+def batch_rag_answer(collection, questions, client, model: str, get_context_with_sources, build_messages,
+                     n_results: int = 4, max_concurrency: int = 8, requests_per_minute: int = None):
+    """Answer many questions: one vectorized retrieval, then concurrent completions.
+
+    Returns a list of (answer, sources) in the same order as questions. A
+    question whose completion fails gets the error message as its answer.
+    """
+    results = batch_semantic_search(collection, questions, n_results)
+    limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+
+    def answer(question, result):
+        context, sources = get_context_with_sources(result)
+        if not context.strip():
+            return "", []
+        try:
+            return complete_with_retry(client, model, build_messages(context, question), limiter), sources
+        except Exception as e:
+            return f"Error: {e}", sources
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return list(executor.map(answer, questions, results))
@@ -0,0 +1,221 @@
+"""Offline Simple-RAG benchmark.
+
+Generates a synthetic labelled corpus and measures ingestion throughput,
+embedding time, Chroma query latency at several collection sizes, recall@k
+and end-to-end answer latency with a local stub LLM. Results are written as
+JSON so runs can be compared across changes.
+
+    python benchmark.py --docs 200 --sizes 1000 5000 --output bench.json
+    python benchmark.py --embedder minilm      # real model instead of hashing
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+import types
+
+import chromadb
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from batch import batch_rag_answer
+from context_packer import pack_context
+from ingestion import iter_document_chunks
+
+WORDS = (
+    "model layer network training dataset accuracy latency inference detector "
+    "anchor feature backbone scale loss gradient batch kernel channel tensor "
+    "memory throughput benchmark baseline module block attention pooling "
+    "stride resolution label box object image video frame speed parameter"
+).split()
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """Deterministic bag-of-words embedding that needs no model download"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def __call__(self, input: Documents) -> Embeddings:
+        vectors = np.zeros((len(input), self.dim), dtype=np.float32)
+        for row, text in enumerate(input):
+            for word in text.lower().split():
+                digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+                vectors[row, int.from_bytes(digest, "little") % self.dim] += 1.0
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return list(vectors)
+
+
+class StubLLM:
+    """OpenAI-compatible client whose completion echoes the first context sentence"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        context = messages[-1]["content"].split("Context:\n", 1)[-1]
+        message = types.SimpleNamespace(content=context.split(". ")[0])
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+def build_messages(context: str, question: str):
+    return [{"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}\nAnswer:"}]
+
+
+def generate_corpus(directory: str, n_docs: int, words_per_doc: int, seed: int = 0):
+    """Write n_docs synthetic .txt files, each holding one unique fact; return (paths, queries)"""
+    rng = random.Random(seed)
+    paths, queries = [], []
+    for i in range(n_docs):
+        code = f"zx{i:05d}"
+        fact = f"The {code} detector reaches {rng.randint(10, 99)} percent accuracy on the {code} dataset."
+        words = [rng.choice(WORDS) for _ in range(words_per_doc)]
+        position = rng.randint(0, len(words))
+        text = " ".join(words[:position]) + " " + fact + " " + " ".join(words[position:])
+        path = os.path.join(directory, f"doc_{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        paths.append(path)
+        queries.append({"query": f"What accuracy does the {code} detector reach", "source": os.path.basename(path)})
+    return paths, queries
+
+
+def percentiles(samples):
+    values = np.asarray(samples) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+    }
+
+
+def bench_ingestion(paths):
+    start = time.perf_counter()
+    ids, chunks, metadatas = [], [], []
+    for path in paths:
+        for chunk_id, chunk, metadata in iter_document_chunks(path):
+            ids.append(chunk_id)
+            chunks.append(chunk)
+            metadatas.append(metadata)
+    elapsed = time.perf_counter() - start
+    stats = {
+        "docs": len(paths),
+        "chunks": len(chunks),
+        "seconds": elapsed,
+        "docs_per_sec": len(paths) / elapsed,
+        "chunks_per_sec": len(chunks) / elapsed,
+    }
+    return stats, ids, chunks, metadatas
+
+
+def bench_embedding(embedding_function, chunks, batch_size: int = 256):
+    start = time.perf_counter()
+    embeddings = []
+    for i in range(0, len(chunks), batch_size):
+        embeddings.extend(embedding_function(chunks[i:i + batch_size]))
+    elapsed = time.perf_counter() - start
+    return {"chunks": len(chunks), "seconds": elapsed, "chunks_per_sec": len(chunks) / elapsed}, embeddings
+
+
+def recall_at_k(collection, query_embeddings, queries, k: int):
+    results = collection.query(query_embeddings=query_embeddings, n_results=k, include=["metadatas"])
+    found = sum(
+        any(meta["source"] == query["source"] for meta in metadatas)
+        for metadatas, query in zip(results["metadatas"], queries)
+    )
+    return found / len(queries)
+
+
+def run(args):
+    embedding_function = HashingEmbeddingFunction()
+    if args.embedder == "minilm":
+        from chromadb.utils import embedding_functions
+        embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
+
+    report = {"config": vars(args)}
+    with tempfile.TemporaryDirectory() as directory:
+        paths, queries = generate_corpus(directory, args.docs, args.words_per_doc, args.seed)
+        report["ingestion"], ids, chunks, metadatas = bench_ingestion(paths)
+        report["embedding"], embeddings = bench_embedding(embedding_function, chunks)
+
+        queries = queries[:args.queries]
+        query_embeddings = embedding_function([query["query"] for query in queries])
+
+        client = chromadb.EphemeralClient()
+        report["query_latency"] = []
+        # Grow one collection to each target size by repeating the corpus under new ids.
+        collection = client.create_collection(name="benchmark", embedding_function=None)
+        size = 0
+        for target in sorted(args.sizes):
+            while size < target:
+                i = size % len(chunks)
+                step = min(len(chunks) - i, target - size, 4096)
+                collection.add(
+                    ids=[f"{size + n}" for n in range(step)],
+                    documents=chunks[i:i + step],
+                    metadatas=metadatas[i:i + step],
+                    embeddings=embeddings[i:i + step],
+                )
+                size += step
+
+            samples = []
+            for embedding in query_embeddings:
+                start = time.perf_counter()
+                collection.query(query_embeddings=[embedding], n_results=args.k, include=["documents", "metadatas"])
+                samples.append(time.perf_counter() - start)
+            report["query_latency"].append({"collection_size": size, **percentiles(samples)})
+
+        recall_collection = client.create_collection(name="benchmark_recall", embedding_function=embedding_function)
+        for i in range(0, len(chunks), 4096):
+            recall_collection.add(ids=ids[i:i + 4096], documents=chunks[i:i + 4096],
+                      metadatas=metadatas[i:i + 4096], embeddings=embeddings[i:i + 4096])
+        report["recall"] = {f"recall@{k}": recall_at_k(recall_collection, query_embeddings, queries, k) for k in (1, 3, 5, 10)}
+
+        start = time.perf_counter()
+        answers = batch_rag_answer(
+            recall_collection, [query["query"] for query in queries], StubLLM(args.llm_delay), "stub",
+            lambda results: pack_context(results, max_tokens=args.context_tokens), build_messages,
+            n_results=args.k, max_concurrency=args.concurrency
+        )
+        elapsed = time.perf_counter() - start
+        report["answer"] = {
+            "questions": len(answers),
+            "seconds": elapsed,
+            "questions_per_sec": len(answers) / elapsed,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Simple-RAG benchmark")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--words-per-doc", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 5000, 20000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--embedder", choices=["hash", "minilm"], default="hash")
+    parser.add_argument("--context-tokens", type=int, default=1500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-delay", type=float, default=0.0, help="seconds per stub completion")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+        print(f"✅ Benchmark results saved to '{args.output}'")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
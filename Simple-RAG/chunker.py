@@ -0,0 +1,149 @@
+import re
+
+# all-MiniLM-L6-v2 truncates input after 256 word pieces, two of which are
+# the [CLS] and [SEP] special tokens.
+MODEL_MAX_TOKENS = 256
+MAX_TOKENS = MODEL_MAX_TOKENS - 2
+
+SENTENCE_END = re.compile(r"(?<=[.!?؟])\s+|\n\s*\n")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+WORD = re.compile(r"\S+")
+APPROX_TOKEN = re.compile(r"[^\W\d_]+|\d|[^\w\s]|_")
+# approx_token_count can still undercount word pieces ("YOLOv7" is four), so
+# without a real tokenizer chunks are only packed to this share of max_tokens.
+APPROX_MARGIN = 0.8
+# Characters of streamed text kept in memory by stream_chunks.
+STREAM_BUFFER_CHARS = 20_000
+
+
+def approx_token_count(text: str):
+    """Conservative word-piece estimate when no tokenizer is given.
+
+    Digits and punctuation count one each, long ASCII words a little extra,
+    and non-ASCII letters (which an English vocabulary mostly splits into
+    single characters) one per character.
+    """
+    count = 0
+    for match in APPROX_TOKEN.finditer(text):
+        piece = match.group()
+        if not piece.isascii():
+            count += len(piece)
+        else:
+            count += 1 + (len(piece) - 1) // 8
+    return count
+
+
+def tokenizer_counter(tokenizer):
+    """Exact token counter from a Hugging Face tokenizer (e.g. SentenceTransformer(...).tokenizer)"""
+    return lambda text: len(tokenizer.tokenize(text))
+
+
+def _trim(text: str, start: int, end: int):
+    """Shrink a span so it does not start or end on whitespace"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def iter_sentence_spans(text: str, respect_paragraphs: bool = True):
+    """Yield (start, end, paragraph_end) for each sentence in text, without copying it"""
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        s, e = _trim(text, start, match.start())
+        if s < e:
+            paragraph_end = respect_paragraphs and PARAGRAPH_BREAK.fullmatch(match.group()) is not None
+            yield s, e, paragraph_end
+        start = match.end()
+    s, e = _trim(text, start, len(text))
+    if s < e:
+        yield s, e, True
+
+
+def _split_long_span(text: str, start: int, end: int, max_tokens: int, count_tokens):
+    """Split a sentence that does not fit the budget on word boundaries"""
+    piece_start = None
+    piece_end = None
+    tokens = 0
+    for match in WORD.finditer(text, start, end):
+        n = count_tokens(match.group())
+        if piece_start is not None and tokens + n > max_tokens:
+            yield piece_start, piece_end, tokens
+            piece_start, tokens = None, 0
+        if piece_start is None:
+            piece_start = match.start()
+        piece_end = match.end()
+        tokens += n
+    if piece_start is not None:
+        yield piece_start, piece_end, tokens
+
+
+def chunk_spans(text: str, max_tokens: int = MAX_TOKENS, overlap_sentences: int = 1,
+                respect_paragraphs: bool = True, count_tokens=None):
+    """Lazily yield (start, end) offsets of sentence-aligned chunks of text.
+
+    Sentences are packed into a chunk until the next one would exceed
+    max_tokens; a chunk never crosses a paragraph break when
+    respect_paragraphs is set. The last `overlap_sentences` sentences of a
+    chunk are repeated at the start of the next one if they fit. Without
+    count_tokens the approximate counter is used with APPROX_MARGIN.
+    """
+    if count_tokens is None:
+        count_tokens = approx_token_count
+        max_tokens = int(max_tokens * APPROX_MARGIN)
+    window = []  # (start, end, tokens) of sentences in the current chunk
+    tokens = 0
+
+    def flush():
+        return window[0][0], window[-1][1]
+
+    for s, e, paragraph_end in iter_sentence_spans(text, respect_paragraphs):
+        n = count_tokens(text[s:e])
+        pieces = [(s, e, n)] if n <= max_tokens else list(_split_long_span(text, s, e, max_tokens, count_tokens))
+
+        for piece in pieces:
+            if window and tokens + piece[2] > max_tokens:
+                yield flush()
+                carry = window[-overlap_sentences:] if overlap_sentences else []
+                while carry and sum(p[2] for p in carry) + piece[2] > max_tokens:
+                    carry = carry[1:]
+                window = list(carry)
+                tokens = sum(p[2] for p in window)
+            window.append(piece)
+            tokens += piece[2]
+
+        if paragraph_end and window:
+            yield flush()
+            window, tokens = [], 0
+
+    if window:
+        yield flush()
+
+
+def materialize(text: str, spans):
+    """Turn spans into chunk strings, one at a time (call this at embed time)"""
+    for start, end in spans:
+        yield text[start:end].replace("\n", " ")
+
+
+def stream_chunks(pieces, max_tokens: int = MAX_TOKENS, count_tokens=None, buffer_chars: int = STREAM_BUFFER_CHARS):
+    """Sentence-aligned chunks of a stream of text pieces (e.g. PDF pages).
+
+    Spans are computed over a rolling buffer of about buffer_chars and
+    materialized one chunk at a time; the last chunk of each buffer may
+    continue in the next piece, so it is chunked again with the text that
+    follows.
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) < buffer_chars:
+            continue
+        spans = list(chunk_spans(buffer, max_tokens, count_tokens=count_tokens))
+        if len(spans) < 2:
+            continue
+        yield from materialize(buffer, spans[:-1])
+        buffer = buffer[spans[-1][0]:]
+    if buffer.strip():
+        yield from materialize(buffer, chunk_spans(buffer, max_tokens, count_tokens=count_tokens))
@@ -0,0 +1,119 @@
+import bisect
+import re
+
+from chunker import approx_token_count
+
+# A shared suffix/prefix must be at least this many whole words to count as
+# overlap, so a chance match like "the" + "end" is not glued into "thend".
+MIN_OVERLAP_WORDS = 3
+# A passage that only fits when truncated is kept if at least this much of it fits.
+MIN_TRUNCATED_TOKENS = 32
+WORD_END = re.compile(r"\S(?=\s|$)")
+
+
+def merge_overlap(a: str, b: str, min_words: int = MIN_OVERLAP_WORDS):
+    """Join two consecutive chunks, removing the text they share (suffix of a == prefix of b).
+
+    The overlap must be whole words on both sides and at least min_words
+    long; it can be as long as the shorter chunk (the chunker repeats whole
+    sentences).
+    """
+    ends = [match.end() for match in WORD_END.finditer(b)]  # candidate overlap lengths
+    for n in range(len(ends), min_words - 1, -1):
+        k = ends[n - 1]
+        if k <= len(a) and a.endswith(b[:k]) and (k == len(a) or a[-k - 1].isspace()):
+            return a + b[k:]
+    return a + " " + b
+
+
+def truncate_to_tokens(text: str, max_tokens: int, count_tokens=approx_token_count):
+    """Longest prefix of text, cut after a word, that fits in max_tokens"""
+    ends = [match.end() for match in WORD_END.finditer(text)]
+    n = bisect.bisect_right(range(len(ends)), max_tokens, key=lambda i: count_tokens(text[:ends[i]]))
+    return text[:ends[n - 1]] if n else ""
+
+
+def _shingles(text: str, n: int = 3):
+    words = text.lower().split()
+    return {tuple(words[i:i + n]) for i in range(max(len(words) - n + 1, 1))}
+
+
+def _contained(a: set, b: set):
+    """Share of a's shingles that also appear in b"""
+    return len(a & b) / len(a) if a else 0.0
+
+
+def _label(source, indices):
+    if len(indices) == 1:
+        return f"{source} (chunk {indices[0]})"
+    return f"{source} (chunks {indices[0]}-{indices[-1]})"
+
+
+def pack_context(results, max_tokens: int = 1500, dedup_threshold: float = 0.8, count_tokens=None):
+    """Build (context, sources) from search results within a token budget.
+
+    Adjacent chunks of the same source are merged by chunk index with their
+    overlapping text removed, near-duplicate passages are dropped, and the
+    remaining passages are added in relevance order while they fit in
+    max_tokens. A merged passage that does not fit is split back into its
+    chunks, and a single chunk that does not fit is truncated, so the best
+    hits are never dropped just for being long.
+    """
+    if not results or not results.get("documents") or not results["documents"][0]:
+        return "", []
+    count_tokens = count_tokens or approx_token_count
+
+    # rank = position in the results, i.e. relevance order
+    hits = {}
+    for rank, (document, meta) in enumerate(zip(results["documents"][0], results["metadatas"][0])):
+        # Files with the same name in different folders are told apart by path.
+        key = (meta.get("path") or meta.get("source", "?"), meta.get("chunk"))
+        hits.setdefault(key, (rank, document, meta.get("source", "?")))
+
+    by_source = {}
+    for (path, chunk), (rank, document, source) in hits.items():
+        by_source.setdefault(path, []).append((chunk, rank, document, source))
+
+    blocks = []  # (best rank, source, [(chunk, rank, document), ...], text)
+    for items in by_source.values():
+        items.sort(key=lambda item: (item[0] is None, item[0] if item[0] is not None else 0))
+        current = None
+        for chunk, rank, document, source in items:
+            last = current[2][-1][0] if current else None
+            if current and chunk is not None and last is not None and chunk == last + 1:
+                current = (min(current[0], rank), source, current[2] + [(chunk, rank, document)],
+                           merge_overlap(current[3], document))
+            else:
+                if current:
+                    blocks.append(current)
+                current = (rank, source, [(chunk, rank, document)], document)
+        blocks.append(current)
+    blocks.sort(key=lambda block: block[0])
+
+    kept, kept_shingles, sources = [], [], []
+    used = 0
+    while blocks:
+        block = blocks.pop(0)
+        _, source, parts, text = block
+        shingles = _shingles(text)
+        if any(_contained(shingles, other) >= dedup_threshold for other in kept_shingles):
+            continue
+        tokens = count_tokens(text)
+        if used + tokens > max_tokens:
+            if len(parts) > 1:
+                # Too long merged: try its chunks one by one, each at its own rank.
+                for part in parts:
+                    bisect.insort(blocks, (part[1], source, [part], part[2]), key=lambda b: b[0])
+                continue
+            if max_tokens - used < MIN_TRUNCATED_TOKENS:
+                continue
+            text = truncate_to_tokens(text, max_tokens - used, count_tokens)
+            if not text:
+                continue
+            tokens = count_tokens(text)
+        kept.append(text)
+        kept_shingles.append(shingles)
+        sources.append(_label(source, ["?" if part[0] is None else part[0] for part in parts]))
+        used += tokens
+
+    return "\n\n".join(kept), sources
@@ -0,0 +1,141 @@
+import json
+import os
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from indexer import hash_text
+
+CACHE_PATH = "embedding_cache"
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class EmbeddingStore:
+    """Append-only on-disk vector store for one model.
+
+    Vectors live in a raw float32 file that is read through a memory map;
+    the chunk hash of row i is line i of keys.txt.
+    """
+
+    def __init__(self, path: str, dim: int = None):
+        os.makedirs(path, exist_ok=True)
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.keys_path = os.path.join(path, "keys.txt")
+        self.meta_path = os.path.join(path, "meta.json")
+        self.dim = dim
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as file:
+                self.dim = json.load(file)["dim"]
+
+        self.index = {}
+        if self.dim:
+            self._recover()
+        self._mmap = None
+
+    def _recover(self):
+        """Load the key index and cut both files back to the rows that have a complete key.
+
+        An interrupted append can leave vector rows without a key or a
+        partial last key line; new rows are numbered from len(index), so
+        the files must not keep anything past it.
+        """
+        row_bytes = 4 * self.dim
+        rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        keys_end = 0
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "rb") as file:
+                for line in file:
+                    if len(self.index) >= rows or not line.endswith(b"\n"):
+                        break
+                    self.index[line.decode("utf-8").strip()] = len(self.index)
+                    keys_end += len(line)
+            if os.path.getsize(self.keys_path) != keys_end:
+                os.truncate(self.keys_path, keys_end)
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != len(self.index) * row_bytes:
+            os.truncate(self.vectors_path, len(self.index) * row_bytes)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key: str):
+        return key in self.index
+
+    def _vectors(self):
+        if self._mmap is None or self._mmap.shape[0] < len(self.index):
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                   shape=(len(self.index), self.dim))
+        return self._mmap
+
+    def get(self, keys):
+        """Return an (n, dim) float32 array for keys that are all in the store"""
+        rows = [self.index[key] for key in keys]
+        return np.asarray(self._vectors()[rows])
+
+    def add(self, keys, vectors):
+        """Append new vectors (keys already in the store are skipped)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            with open(self.meta_path, "w", encoding="utf-8") as file:
+                json.dump({"dim": self.dim}, file)
+
+        fresh = [i for i, key in enumerate(keys) if key not in self.index]
+        if not fresh:
+            return
+        with open(self.vectors_path, "ab") as file:
+            vectors[fresh].tofile(file)
+        with open(self.keys_path, "a", encoding="utf-8") as file:
+            for i in fresh:
+                self.index[keys[i]] = len(self.index)
+                file.write(keys[i] + "\n")
+
+
+class CachedEmbeddingFunction(EmbeddingFunction):
+    """Chroma embedding function backed by a persistent (model, chunk hash) cache.
+
+    Only texts that are not cached yet are encoded, in batches of `batch_size`.
+    With `workers` > 1 the misses are encoded on a sentence-transformers
+    multi-process pool.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, cache_path: str = CACHE_PATH,
+                 batch_size: int = 64, workers: int = 1):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.workers = workers
+        self.store = EmbeddingStore(os.path.join(cache_path, model_name.replace("/", "__")))
+        self._model = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, texts):
+        """Encode texts with the model, bypassing the cache"""
+        if self.workers > 1 and len(texts) > self.batch_size:
+            pool = self.model.start_multi_process_pool(["cpu"] * self.workers)
+            try:
+                return self.model.encode_multi_process(texts, pool, batch_size=self.batch_size)
+            finally:
+                self.model.stop_multi_process_pool(pool)
+        return self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [hash_text(text) for text in input]
+
+        missing = {}
+        for key, text in zip(keys, input):
+            if key not in self.store and key not in missing:
+                missing[key] = text
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if missing:
+            self.store.add(list(missing), self.encode(list(missing.values())))
+
+        return [vector for vector in self.store.get(keys)]
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import re
+
+from chunker import stream_chunks
+from ingestion import iter_document
+
+CHROMA_PATH = "chroma_db"
+MANIFEST_NAME = "index_manifest.json"
+# Stored per file; files indexed with another chunking scheme are re-chunked.
+CHUNKER = "sentence-spans-1"
+
+
+def hash_text(text: str):
+    """Content hash of a chunk"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def hash_file(file_path: str, block_size: int = 1 << 20):
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(file_path: str):
+    """Manifest key of a file: its normalized absolute path, so equal names in different folders stay apart"""
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def load_manifest(manifest_path: str):
+    """Load the index manifest ({source_key: {"file_hash", "chunker", "chunks": {id: index}}})"""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_manifest(manifest: dict, manifest_path: str):
+    """Atomically write the index manifest"""
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+    os.replace(tmp_path, manifest_path)
+
+
+def chunk_ids(prefix: str, chunks):
+    """Yield (id, chunk) with content-addressed ids: unchanged text keeps its id even if it moves"""
+    seen = {}
+    for chunk in chunks:
+        chunk_hash = hash_text(chunk)
+        n = seen.get(chunk_hash, 0)
+        seen[chunk_hash] = n + 1
+        yield f"{prefix}_{chunk_hash}_{n}", chunk
+
+
+def _in_batches(items, batch_size):
+    for i in range(0, len(items), batch_size):
+        yield items[i:i + batch_size]
+
+
+def index_file(collection, file_path: str, entry: dict = None, batch_size: int = 64, count_tokens=None):
+    """Bring one file's chunks in the collection up to date and return its new manifest entry.
+
+    Chunks are streamed from the document and written in batches, so only
+    the chunk ids (not the text) of the whole file are held in memory.
+    """
+    file_name = os.path.basename(file_path)
+    key = source_key(file_path)
+    prefix = f"{file_name}_{hash_text(key)[:8]}"
+    old_chunks = entry["chunks"] if entry else {}
+    stats = {"added": 0, "updated": 0, "deleted": 0}
+
+    if entry is None:
+        # First time this file is indexed with a manifest: drop anything left
+        # over from a full (non-incremental) ingestion, whose ids are
+        # "<name>_chunk_<i>". Indexed files with the same name are kept.
+        legacy = re.compile(re.escape(file_name) + r"_chunk_\d+")
+        leftovers = [chunk_id for chunk_id in collection.get(where={"source": file_name}, include=[])["ids"]
+                     if legacy.fullmatch(chunk_id)]
+        for batch in _in_batches(leftovers, batch_size):
+            collection.delete(ids=batch)
+
+    new_chunks, moved = [], []  # pending batches of (id, index, text) and (id, index)
+
+    def flush_new():
+        if new_chunks:
+            collection.upsert(
+                ids=[chunk_id for chunk_id, _, _ in new_chunks],
+                documents=[chunk for _, _, chunk in new_chunks],
+                metadatas=[{"source": file_name, "path": key, "chunk": i} for _, i, _ in new_chunks],
+            )
+            stats["added"] += len(new_chunks)
+            new_chunks.clear()
+
+    def flush_moved():
+        if moved:
+            # Only the chunk index changed, so update metadata without re-embedding.
+            collection.update(
+                ids=[chunk_id for chunk_id, _ in moved],
+                metadatas=[{"source": file_name, "path": key, "chunk": i} for _, i in moved],
+            )
+            stats["updated"] += len(moved)
+            moved.clear()
+
+    chunks = {}
+    texts = stream_chunks(iter_document(file_path), count_tokens=count_tokens)
+    for i, (chunk_id, chunk) in enumerate(chunk_ids(prefix, texts)):
+        chunks[chunk_id] = i
+        if chunk_id not in old_chunks:
+            new_chunks.append((chunk_id, i, chunk))
+            if len(new_chunks) >= batch_size:
+                flush_new()
+        elif old_chunks[chunk_id] != i:
+            moved.append((chunk_id, i))
+            if len(moved) >= batch_size:
+                flush_moved()
+    flush_new()
+    flush_moved()
+
+    removed = [chunk_id for chunk_id in old_chunks if chunk_id not in chunks]
+    for batch in _in_batches(removed, batch_size):
+        collection.delete(ids=batch)
+    stats["deleted"] = len(removed)
+
+    return {"chunks": chunks}, stats
+
+
+def _legacy_key(manifest: dict, file_path: str):
+    """Key of an entry from older manifests, which were keyed by file name"""
+    file_name = os.path.basename(file_path)
+    return file_name if file_name in manifest and not os.path.isabs(file_name) else None
+
+
+def _remove_entry(collection, manifest: dict, key: str, batch_size: int):
+    removed = list(manifest.pop(key)["chunks"])
+    for batch in _in_batches(removed, batch_size):
+        collection.delete(ids=batch)
+    return len(removed)
+
+
+def incremental_index(collection, file_paths, chroma_path: str = CHROMA_PATH, batch_size: int = 64,
+                      count_tokens=None, prune: bool = False):
+    """Index new or changed files, embedding only new or changed chunks.
+
+    A manifest of file and chunk hashes is kept next to the Chroma database so
+    unchanged files are skipped without being read or embedded again. Files
+    that are not in file_paths are left alone; with prune=True, files that
+    no longer exist on disk are removed from the index.
+    """
+    manifest_path = os.path.join(chroma_path, MANIFEST_NAME)
+    os.makedirs(chroma_path, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    totals = {"files_indexed": 0, "files_skipped": 0, "files_removed": 0,
+              "added": 0, "updated": 0, "deleted": 0}
+
+    for file_path in file_paths:
+        key = source_key(file_path)
+        legacy = None if key in manifest else _legacy_key(manifest, file_path)
+        file_hash = hash_file(file_path)
+        entry = manifest.get(key) or manifest.get(legacy)
+        if entry and entry["file_hash"] == file_hash and entry.get("chunker") == CHUNKER and not legacy:
+            totals["files_skipped"] += 1
+            continue
+
+        try:
+            new_entry, stats = index_file(collection, file_path, entry, batch_size, count_tokens)
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            continue
+
+        new_entry["file_hash"] = file_hash
+        new_entry["chunker"] = CHUNKER
+        manifest.pop(legacy, None)
+        manifest[key] = new_entry
+        save_manifest(manifest, manifest_path)
+        totals["files_indexed"] += 1
+        for name in stats:
+            totals[name] += stats[name]
+
+    if prune:
+        for key in [key for key in manifest if not os.path.exists(key)]:
+            totals["deleted"] += _remove_entry(collection, manifest, key, batch_size)
+            totals["files_removed"] += 1
+            save_manifest(manifest, manifest_path)
+
+    return totals
+
+
+def remove_files(collection, file_paths, chroma_path: str = CHROMA_PATH, batch_size: int = 64):
+    """Delete the chunks of the given files from the index"""
+    manifest_path = os.path.join(chroma_path, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    totals = {"files_removed": 0, "deleted": 0}
+    for file_path in file_paths:
+        key = source_key(file_path)
+        key = key if key in manifest else _legacy_key(manifest, file_path)
+        if key is None:
+            continue
+        totals["deleted"] += _remove_entry(collection, manifest, key, batch_size)
+        totals["files_removed"] += 1
+        save_manifest(manifest, manifest_path)
+    return totals
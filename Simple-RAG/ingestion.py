@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import docx
+import PyPDF2
+
+from chunker import MAX_TOKENS, stream_chunks
+from page_cache import cached_pages
+
+PARALLEL_MIN_PAGES = 50
+PAGES_PER_TASK = 8
+
+
+def _extract_page_range(file_path: str, start: int, stop: int):
+    """Extract the text of pages [start, stop) from a PDF (runs inside a worker process)"""
+    with open(file_path, "rb") as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [(pdf_reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+def count_pdf_pages(file_path: str):
+    """Return the number of pages in a PDF without extracting any text"""
+    with open(file_path, "rb") as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def iter_pdf_pages(file_path: str):
+    """Yield the text of each PDF page, one page at a time"""
+    with open(file_path, "rb") as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+
+
+def iter_pdf_pages_parallel(file_path: str, workers: int = None, pages_per_task: int = PAGES_PER_TASK):
+    """Yield PDF page texts in order, extracting page ranges across a process pool.
+
+    Only a bounded number of page ranges is in flight at any time, so memory
+    stays flat no matter how long the document is.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = count_pdf_pages(file_path)
+    ranges = [(i, min(i + pages_per_task, total)) for i in range(0, total, pages_per_task)]
+    max_in_flight = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < max_in_flight:
+                start, stop = ranges[next_range]
+                pending.append(executor.submit(_extract_page_range, file_path, start, stop))
+                next_range += 1
+            for text in pending.pop(0).result():
+                yield text
+
+
+def extract_pdf_pages(file_path: str, parallel: bool = None, workers: int = None):
+    """Extract PDF pages serially, or on a process pool for large PDFs"""
+    if parallel is None:
+        parallel = count_pdf_pages(file_path) >= PARALLEL_MIN_PAGES
+    if parallel:
+        return iter_pdf_pages_parallel(file_path, workers)
+    return iter_pdf_pages(file_path)
+
+
+def iter_text_file(file_path: str, block_size: int = 1 << 16):
+    """Yield a text file in fixed-size blocks"""
+    with open(file_path, "r", encoding="utf-8") as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            yield block
+
+
+def iter_docx_paragraphs(file_path: str):
+    """Yield the paragraphs of a Word document"""
+    doc = docx.Document(file_path)
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+
+def iter_document(file_path: str, parallel: bool = None, workers: int = None):
+    """Stream document content based on file extension.
+
+    PDFs yield one page at a time (followed by a newline, like read_pdf_file).
+    Pages come from the page cache when the file was extracted before;
+    otherwise large PDFs (PARALLEL_MIN_PAGES or more) are extracted on a
+    process pool unless `parallel` is set explicitly.
+    """
+    _, file_extension = os.path.splitext(file_path)
+    file_extension = file_extension.lower()
+    if file_extension == ".txt":
+        yield from iter_text_file(file_path)
+    elif file_extension == ".pdf":
+        for page in cached_pages(file_path, lambda path: extract_pdf_pages(path, parallel, workers)):
+            yield page + "\n"
+    elif file_extension == ".docx":
+        yield from iter_docx_paragraphs(file_path)
+    else:
+        raise ValueError(f"Unsupported File Format: {file_extension}")
+
+
+def iter_document_chunks(file_path: str, max_tokens: int = MAX_TOKENS, count_tokens=None, **kwargs):
+    """Stream (id, chunk, metadata) triples for a document as soon as they are ready.
+
+    Chunks are sentence-aligned and fit the embedding model's token window
+    (see chunker.stream_chunks); pass count_tokens for exact token counts.
+    """
+    file_name = os.path.basename(file_path)
+    chunks = stream_chunks(iter_document(file_path, **kwargs), max_tokens, count_tokens)
+    for i, chunk in enumerate(chunks):
+        yield f"{file_name}_chunk_{i}", chunk, {"source": file_name, "chunk": i}
+
+
+def ingest_document(collection, file_path: str, batch_size: int = 64, **kwargs):
+    """Stream a document into a Chroma collection in batches and return the chunk count"""
+    ids, chunks, metadatas = [], [], []
+    total = 0
+    for chunk_id, chunk, metadata in iter_document_chunks(file_path, **kwargs):
+        ids.append(chunk_id)
+        chunks.append(chunk)
+        metadatas.append(metadata)
+        if len(ids) >= batch_size:
+            collection.add(documents=chunks, metadatas=metadatas, ids=ids)
+            total += len(ids)
+            ids, chunks, metadatas = [], [], []
+    if ids:
+        collection.add(documents=chunks, metadatas=metadatas, ids=ids)
+        total += len(ids)
+    return total
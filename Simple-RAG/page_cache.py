@@ -0,0 +1,176 @@
+# Per-page cache of extracted PDF text.
+#
+# Pages are stored zlib-compressed in a small SQLite database keyed by the
+# file's content hash and the page index. The total size is bounded: when it
+# grows past max_bytes, the least recently used documents are evicted.
+# PDF-Summarizer and Simple-RAG use the same default location, so a PDF
+# extracted by one of them is not extracted again by the other.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "youtube-tutorials", "pdf_pages.sqlite")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_default_cache = None
+
+
+def hash_file(file_path, block_size=1 << 20):
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageCache:
+    """SQLite store of compressed page texts, bounded to max_bytes"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    @property
+    def conn(self):
+        # One connection per process: a connection inherited through fork is not usable.
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS documents (
+                    file_hash TEXT PRIMARY KEY, page_count INTEGER, size INTEGER, last_used REAL);
+                CREATE TABLE IF NOT EXISTS pages (
+                    file_hash TEXT, page INTEGER, text BLOB, PRIMARY KEY (file_hash, page));
+            """)
+        return self._conn
+
+    def lookup(self, file_hash):
+        """Page count of a fully extracted document (marking it as recently used), or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT page_count FROM documents WHERE file_hash = ?", (file_hash,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE documents SET last_used = ? WHERE file_hash = ?", (time.time(), file_hash))
+            self.conn.commit()
+            return row[0]
+
+    def iter_pages(self, file_hash, page_count):
+        """Yield the cached pages of a document, a few at a time.
+
+        Stops early at the first missing page (e.g. evicted by another
+        process mid-read); callers compare the number of pages they got
+        with page_count.
+        """
+        page = 0
+        while page < page_count:
+            with self.lock:
+                batch = self.conn.execute(
+                    "SELECT page, text FROM pages WHERE file_hash = ? AND page >= ? ORDER BY page LIMIT 64",
+                    (file_hash, page)).fetchall()
+            if not batch:
+                return
+            for number, text in batch:
+                if number != page:
+                    return
+                yield zlib.decompress(text).decode("utf-8")
+                page += 1
+
+    def put_pages(self, file_hash, first_page, texts):
+        """Store consecutive pages starting at first_page"""
+        rows = [(file_hash, first_page + i, zlib.compress(text.encode("utf-8"))) for i, text in enumerate(texts)]
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", rows)
+            self.conn.commit()
+
+    def discard(self, file_hash):
+        """Forget a document and all of its pages"""
+        with self.lock:
+            self.conn.execute("DELETE FROM documents WHERE file_hash = ?", (file_hash,))
+            self.conn.execute("DELETE FROM pages WHERE file_hash = ?", (file_hash,))
+            self.conn.commit()
+
+    def complete(self, file_hash, page_count):
+        """Mark a document as fully extracted and evict old documents if the cache is too big"""
+        with self.lock:
+            size = self.conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(text)), 0) FROM pages WHERE file_hash = ?", (file_hash,)).fetchone()[0]
+            self.conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                              (file_hash, page_count, size, time.time()))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+            # Pages without a document row are left over from extractions that
+            # never completed; they count against the budget and go first.
+            orphans = self.conn.execute(
+                "SELECT file_hash, SUM(LENGTH(text)) FROM pages WHERE file_hash != ? "
+                "AND file_hash NOT IN (SELECT file_hash FROM documents) GROUP BY file_hash",
+                (file_hash,)).fetchall()
+            total += sum(orphan_size for _, orphan_size in orphans)
+            for orphan_hash, orphan_size in orphans:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM pages WHERE file_hash = ?", (orphan_hash,))
+                total -= orphan_size
+            for old_hash, old_size in self.conn.execute(
+                    "SELECT file_hash, size FROM documents WHERE file_hash != ? ORDER BY last_used",
+                    (file_hash,)).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM documents WHERE file_hash = ?", (old_hash,))
+                self.conn.execute("DELETE FROM pages WHERE file_hash = ?", (old_hash,))
+                total -= old_size
+            self.conn.commit()
+
+
+def default_cache():
+    """Process-wide cache at DEFAULT_CACHE_PATH"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PageCache()
+    return _default_cache
+
+
+def cached_pages(file_path, extract_pages, cache=None, batch_size=16):
+    """Yield page texts from the cache, or from extract_pages(file_path) while filling the cache"""
+    cache = cache or default_cache()
+    file_hash = hash_file(file_path)
+    page_count = cache.lookup(file_hash)
+    served = 0
+    if page_count is not None:
+        for text in cache.iter_pages(file_hash, page_count):
+            served += 1
+            yield text
+        if served == page_count:
+            return
+        # Pages went missing while reading: extract again, skipping the ones already served.
+        cache.discard(file_hash)
+
+    pending = []
+    count = 0
+    completed = False
+    try:
+        for text in extract_pages(file_path):
+            pending.append(text)
+            if count + len(pending) > served:
+                yield text
+            if len(pending) >= batch_size:
+                cache.put_pages(file_hash, count, pending)
+                count += len(pending)
+                pending = []
+        if pending:
+            cache.put_pages(file_hash, count, pending)
+            count += len(pending)
+        cache.complete(file_hash, count)
+        completed = True
+    finally:
+        # The consumer stopped early or extraction failed: drop the partial pages.
+        if not completed:
+            cache.discard(file_hash)
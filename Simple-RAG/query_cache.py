@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from indexer import CHROMA_PATH, MANIFEST_NAME
+
+
+def normalize_query(query: str):
+    """Case- and whitespace-insensitive form of a query for exact matching"""
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """Two-tier cache for search results and answers.
+
+    Tier 1 is an exact-match LRU on the normalized query. Tier 2 matches
+    near-duplicate questions whose query embeddings have a cosine similarity
+    of at least `similarity`. Entries expire after `ttl` seconds, the cache
+    holds at most `max_size` entries, and everything is dropped when the
+    collection changes (its size or the indexer manifest). Safe to share
+    between threads; the lock is never held while embedding or computing.
+    """
+
+    def __init__(self, embedding_function, collection=None, max_size: int = 256, ttl: float = 3600.0,
+                 similarity: float = 0.95, chroma_path: str = CHROMA_PATH):
+        self.embedding_function = embedding_function
+        self.collection = collection
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity = similarity
+        self.manifest_path = os.path.join(chroma_path, MANIFEST_NAME)
+        self.entries = OrderedDict()  # key -> (created, value, unit embedding, cost)
+        self.lock = threading.Lock()
+        self.fingerprint = self._fingerprint()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _fingerprint(self):
+        if self.collection is None:
+            return None
+        mtime = os.path.getmtime(self.manifest_path) if os.path.exists(self.manifest_path) else None
+        return self.collection.count(), mtime
+
+    def invalidate(self):
+        """Drop every cached entry"""
+        with self.lock:
+            self.entries.clear()
+
+    def _check_collection(self, fingerprint):
+        # Called with the lock held; the fingerprint is read before taking it.
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.entries.clear()
+
+    def embed(self, query: str):
+        """Query embedding from the collection's embedding function"""
+        return np.asarray(self.embedding_function([query])[0], dtype=np.float32)
+
+    def _hit(self, key, counter):
+        # Called with the lock held.
+        created, value, embedding, cost = self.entries[key]
+        self.entries.move_to_end(key)
+        self.saved_seconds += cost
+        setattr(self, counter, getattr(self, counter) + 1)
+        return value
+
+    def lookup(self, kind: str, query: str, params=()):
+        """Return (found, value, query embedding or None)"""
+        fingerprint = self._fingerprint()
+        key = (kind, params, normalize_query(query))
+        with self.lock:
+            self._check_collection(fingerprint)
+            now = time.time()
+            for expired in [k for k, entry in self.entries.items() if now - entry[0] > self.ttl]:
+                del self.entries[expired]
+            if key in self.entries:
+                return True, self._hit(key, "exact_hits"), None
+
+        embedding = self.embed(query)
+        unit = embedding / (np.linalg.norm(embedding) or 1.0)
+        with self.lock:
+            candidates = [k for k in self.entries if k[0] == kind and k[1] == params]
+            if candidates:
+                scores = np.stack([self.entries[k][2] for k in candidates]) @ unit
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity:
+                    return True, self._hit(candidates[best], "semantic_hits"), embedding
+            self.misses += 1
+        return False, None, embedding
+
+    def store(self, kind: str, query: str, params, value, embedding, cost: float):
+        """Remember a computed value, evicting the least recently used entry when full"""
+        key = (kind, params, normalize_query(query))
+        unit = embedding / (np.linalg.norm(embedding) or 1.0)
+        with self.lock:
+            self.entries[key] = (time.time(), value, unit, cost)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, kind: str, query: str, params, compute):
+        """Return the cached value for query or call compute(embedding) and cache it"""
+        found, value, embedding = self.lookup(kind, query, params)
+        if found:
+            return value
+        start = time.perf_counter()
+        value = compute(embedding)
+        self.store(kind, query, params, value, embedding, time.perf_counter() - start)
+        return value
+
+    def stats(self):
+        """Hit rate and latency saved so far"""
+        with self.lock:
+            total = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "requests": total,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.semantic_hits) / total if total else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+                "size": len(self.entries),
+            }
+
+    def report(self):
+        """Print cache statistics"""
+        stats = self.stats()
+        print("\n=== QUERY CACHE ===")
+        print(f"Requests: {stats['requests']} | Hit rate: {stats['hit_rate']:.1%} "
+              f"(exact {stats['exact_hits']}, semantic {stats['semantic_hits']})")
+        print(f"Saved latency: {stats['saved_seconds']}s | Entries: {stats['size']}")
+
+
+def cached_semantic_search(cache: QueryCache, collection, query: str, n_results: int = 2):
+    """semantic_search through the cache; on a miss the query embedding is reused for Chroma"""
+    def compute(embedding):
+        return collection.query(
+            query_embeddings=[embedding.tolist()],
+            n_results=n_results,
+            include=["documents", "metadatas"]
+        )
+    return cache.get_or_compute("search", query, (n_results,), compute)
@@ -0,0 +1,126 @@
+"""Long-running Simple-RAG server.
+
+Loads the embedding model, the Chroma collection and the LLM client once and
+keeps them warm, so retrieval answers in milliseconds instead of paying the
+cold start on every call.
+
+    python server.py --port 8000
+
+    POST /ingest  {"paths": ["a.pdf", "b.txt"]}            add or re-index files
+    POST /remove  {"paths": ["old.pdf"]}                    drop files from the index
+    POST /query   {"query": "...", "n_results": 4}          semantic search
+    POST /answer  {"query": "...", "n_results": 4,
+                   "context_tokens": 1500}                  RAG answer + sources
+    GET  /health  GET /stats
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import Simple_RAG as rag
+from query_cache import cached_semantic_search
+
+
+def warm_up():
+    """Load the model and open the collection before the first request"""
+    start = time.perf_counter()
+    collection = rag.get_collection()
+    rag.get_embedding_function()(["warm up"])
+    rag.get_llm_client()
+    rag.get_query_cache()
+    print(f"🔥 Warmed up in {time.perf_counter() - start:.2f}s ({collection.count()} chunks)")
+
+
+def handle_ingest(body):
+    # Add/update only: files already indexed but not listed here are kept.
+    return rag.incremental_index(rag.get_collection(), body["paths"], count_tokens=rag.get_token_counter())
+
+
+def handle_remove(body):
+    return rag.remove_files(rag.get_collection(), body["paths"])
+
+
+def handle_query(body):
+    collection = rag.get_collection()
+    results = cached_semantic_search(rag.get_query_cache(), collection, body["query"], body.get("n_results", 4))
+    context, sources = rag.get_context_with_sources(results, max_tokens=body.get("context_tokens"))
+    return {"context": context, "sources": sources}
+
+
+def handle_answer(body):
+    query = body["query"]
+    n_results = body.get("n_results", 4)
+    context_tokens = body.get("context_tokens")
+    model = body.get("model", rag.OPEN_ROUTER_MODEL_NAME)
+    answer, sources = rag.get_query_cache().get_or_compute(
+        "answer", query, (n_results, model, context_tokens),
+        lambda embedding: rag.generate_answer(rag.get_collection(), query, n_results, model, context_tokens)
+    )
+    return {"answer": answer, "sources": sources}
+
+
+ROUTES = {
+    ("POST", "/ingest"): handle_ingest,
+    ("POST", "/remove"): handle_remove,
+    ("POST", "/query"): handle_query,
+    ("POST", "/answer"): handle_answer,
+    ("GET", "/health"): lambda body: {"status": "ok"},
+    ("GET", "/stats"): lambda body: {"chunks": rag.get_collection().count(), "cache": rag.get_query_cache().stats()},
+}
+
+
+class RAGHandler(BaseHTTPRequestHandler):
+    def _send(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method):
+        handler = ROUTES.get((method, self.path))
+        if handler is None:
+            self._send(404, {"error": f"Unknown endpoint: {method} {self.path}"})
+            return
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            payload = handler(body)
+        except (KeyError, ValueError) as e:
+            self._send(400, {"error": f"Bad request: {e}"})
+            return
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        payload["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._send(200, payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm Simple-RAG server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    warm_up()
+    server = ThreadingHTTPServer((args.host, args.port), RAGHandler)
+    print(f"🚀 Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Bye!")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import time
+
+
+def stream_completion(client, model: str, messages, metrics: dict = None,
+                      temperature: float = 0.2, max_tokens: int = 512):
+    """Yield answer text pieces as they arrive from an OpenAI-compatible endpoint.
+
+    If a metrics dict is given it is filled with time_to_first_token,
+    total_time, completion_tokens and tokens_per_second once the stream ends.
+    """
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    first_token = None
+    pieces = 0
+    usage_tokens = None
+
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage_tokens = chunk.usage.completion_tokens
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            pieces += 1
+            yield content
+
+    total = time.perf_counter() - start
+    tokens = usage_tokens or pieces
+    generation_time = total - (first_token or 0.0)
+    metrics.update({
+        "time_to_first_token": first_token,
+        "total_time": total,
+        "completion_tokens": tokens,
+        "tokens_per_second": tokens / generation_time if generation_time > 0 else None,
+    })
+
+
+def print_stream_metrics(metrics: dict):
+    """Print time-to-first-token and generation speed"""
+    ttft = metrics.get("time_to_first_token")
+    tps = metrics.get("tokens_per_second")
+    print("\n=== METRICS ===")
+    print(f"Time to first token: {ttft:.2f}s" if ttft is not None else "Time to first token: -")
+    print(f"Total time: {metrics['total_time']:.2f}s | Tokens: {metrics['completion_tokens']}"
+          + (f" | {tps:.1f} tokens/sec" if tps else ""))
@@ -1,8 +1,18 @@
+import argparse
+import time
+
 from ollama import Client
 
+from memory import HISTORY_TOKENS, ConversationMemory
+
 OLLAMA_MODEL = "gpt-oss:120b-cloud"
 OLLAMA_API_KEY = "***"
 
+SYSTEM_PROMPT = """
+    Answer briefly and to the point. 
+    Avoid unnecessary explanations.
+"""
+
 def create_client(api_key):
     return Client(
         host="https://ollama.com",
@@ -16,10 +26,7 @@ def ask_ollama(client, prompt):
             messages=[
                 {
                     "role": "system", 
-                    "content": """
-                        Answer briefly and to the point. 
-                        Avoid unnecessary explanations.
-                    """
+                    "content": SYSTEM_PROMPT
                 },
                 {"role": "user", "content": prompt}
             ],
@@ -29,8 +36,39 @@ def ask_ollama(client, prompt):
     except Exception as e:
         return f"Error: {e}"
 
-def main():
+def stream_ollama(client, prompt, memory=None):
+    """Print the reply as it streams in; return (reply, seconds to first token, total seconds)"""
+    messages = memory.messages(SYSTEM_PROMPT, prompt) if memory else [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    start = time.perf_counter()
+    first_token = None
+    parts = []
+    print("🧠 AI: ", end="", flush=True)
+    try:
+        for chunk in client.chat(model=OLLAMA_MODEL, messages=messages, stream=True):
+            content = chunk.message.content
+            if not content:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - start
+                content = content.lstrip()
+            parts.append(content)
+            print(content, end="", flush=True)
+    except Exception as e:
+        print(f"Error: {e}")
+        return None, first_token, time.perf_counter() - start
+    print()
+    reply = "".join(parts).strip()
+    if memory:
+        memory.add_turn(prompt, reply)
+    return reply, first_token, time.perf_counter() - start
+
+
+def main(stream=True, budget=HISTORY_TOKENS):
     client = create_client(OLLAMA_API_KEY)
+    memory = ConversationMemory(client, OLLAMA_MODEL, budget) if stream else None
     
     print("🤖 Type exit to quit")
 
@@ -40,9 +78,18 @@ def main():
             print("👋 Bye!")
             break
 
-        response = ask_ollama(client, user_input)
-        print("🧠 AI:", response)
+        if not stream:
+            response = ask_ollama(client, user_input)
+            print("🧠 AI:", response)
+            continue
+
+        reply, first_token, total = stream_ollama(client, user_input, memory)
+        if reply is not None and first_token is not None:
+            print(f"⏱️ first token {first_token:.2f}s, total {total:.2f}s, history ~{memory.prompt_tokens()} tokens")
 
 if __name__ == "__main__":
-    main()
-        
+    parser = argparse.ArgumentParser(description="Terminal chatbot")
+    parser.add_argument("--no-stream", action="store_true", help="single-turn requests without streaming or memory")
+    parser.add_argument("--budget", type=int, default=HISTORY_TOKENS, help="token budget for conversation history")
+    args = parser.parse_args()
+    main(not args.no_stream, args.budget)
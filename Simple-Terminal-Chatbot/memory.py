@@ -0,0 +1,106 @@
+# Conversation memory kept under a fixed token budget.
+#
+# Recent turns are sent verbatim. When they no longer fit in the budget, the
+# oldest turns are moved out of the window and folded into a running summary
+# by a background thread, so the next reply never waits for summarization
+# and the prompt size stays bounded however long the session runs.
+
+import threading
+
+HISTORY_TOKENS = 2000
+SUMMARY_TOKENS = 300
+MIN_RECENT_TURNS = 2
+TRUNCATION_MARKER = "\n[... truncated ...]\n"
+
+SUMMARY_PROMPT = """
+    Update the running summary of a conversation with the new exchanges below.
+    Keep names, facts, decisions and open questions; drop small talk.
+    Reply with the updated summary only, in at most {words} words.
+"""
+
+
+def approx_tokens(text):
+    """Rough token count: about 4 characters per token"""
+    return len(text) // 4 + 1
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Keep the start and end of text so that it fits in about max_tokens"""
+    if approx_tokens(text) <= max_tokens:
+        return text
+    keep = max((max_tokens - 1) * 4 - len(TRUNCATION_MARKER), 0)
+    return text[:keep - keep // 2] + TRUNCATION_MARKER + text[len(text) - keep // 2:]
+
+
+def _turn_tokens(turn):
+    return sum(approx_tokens(message["content"]) for message in turn)
+
+
+class ConversationMemory:
+    def __init__(self, client, model, budget=HISTORY_TOKENS, summary_tokens=SUMMARY_TOKENS):
+        self.client = client
+        self.model = model
+        self.budget = budget
+        self.summary_tokens = summary_tokens
+        self.summary = ""
+        self.turns = []  # [[user message, assistant message], ...]
+        self._pending = []  # turns moved out of the window, waiting to be summarized
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def messages(self, system_prompt, prompt):
+        """Chat messages for the next request: system prompt, summary, recent turns, prompt"""
+        with self._lock:
+            system = system_prompt
+            if self.summary:
+                system += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+            history = [message for turn in self.turns for message in turn]
+        return [{"role": "system", "content": system}, *history, {"role": "user", "content": prompt}]
+
+    def add_turn(self, prompt, reply):
+        """Record an exchange and start summarizing turns that fall out of the budget"""
+        # The newest MIN_RECENT_TURNS turns are always kept, so each may use
+        # at most its share of the budget; longer messages are cut in the middle.
+        message_tokens = self.budget // MIN_RECENT_TURNS // 2
+        prompt, reply = truncate_to_tokens(prompt, message_tokens), truncate_to_tokens(reply, message_tokens)
+        with self._lock:
+            self.turns.append([{"role": "user", "content": prompt}, {"role": "assistant", "content": reply}])
+            while len(self.turns) > MIN_RECENT_TURNS and sum(map(_turn_tokens, self.turns)) > self.budget:
+                self._pending.append(self.turns.pop(0))
+            if self._pending and self._worker is None:
+                self._worker = threading.Thread(target=self._summarize_pending, daemon=True)
+                self._worker.start()
+
+    def _summarize_pending(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                turns, self._pending = self._pending, []
+                summary = self.summary
+            exchanges = "\n".join(f"{m['role']}: {m['content']}" for turn in turns for m in turn)
+            try:
+                response = self.client.chat(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SUMMARY_PROMPT.format(words=int(self.summary_tokens * 0.75))},
+                        {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew exchanges:\n{exchanges}"},
+                    ],
+                )
+                summary = response.message.content.strip()
+            except Exception:
+                # Keep the old summary plus a truncated copy of the turns rather than losing them.
+                summary = (summary + "\n" + exchanges).strip()
+            with self._lock:
+                self.summary = summary[-self.summary_tokens * 4:]
+
+    def wait(self, timeout=None):
+        """Block until background summarization is done"""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def prompt_tokens(self):
+        with self._lock:
+            return approx_tokens(self.summary) + sum(map(_turn_tokens, self.turns))